@@ -1,12 +1,26 @@
+import functools
 import streamlit as st
+import numpy as np
 import pandas as pd
 import os
-import random
-from itertools import combinations
-from collections import Counter
+import uuid
 import plotly.express as px
-import plotly.graph_objects as go
-import time # Importar time para simular o save/load
+from mega_backtest import TAMANHOS_PADRAO, executar_backtest
+from mega_cache import CACHE_ANALISES, chave_analise
+from mega_cartoes import grade_cartoes
+from mega_dados import assinatura_arquivo, carregar_tabela, diretorio_cache_padrao, ler_novos_concursos
+from mega_estatisticas import EH_PRIMO, matriz_pares, resumir_padroes, tabela_pares, tabela_trios
+from mega_estrategias import (
+    gerar_jogo_aleatorio_inteligente, gerar_jogo_atrasadas, gerar_jogo_balanceado,
+    gerar_jogo_otimizado, gerar_jogo_quentes,
+)
+from mega_fechamentos import GARANTIAS, gerar_fechamento, limite_inferior_schonheim, verificar_fechamento
+from mega_historico import HistoricoMega
+from mega_ingestao import ARQUIVOS_ENTRADA, PublicacaoHistorico
+from mega_jogos_salvos import RepositorioJogos, montar_conferencia
+from mega_perfil import Perfilador
+from mega_simulacao import SIMULACOES_PADRAO, adicionar_p_valores_pares, simular_acaso, tabela_significancia
+from mega_varredura import ARQUIVO_SCORES, TOP_K_PADRAO, varrer_combinacoes
 
 # --- Configuração da Página ---
 st.set_page_config(layout="wide", page_title="Analisador Mega-Sena PRO")
@@ -42,227 +56,93 @@ if not ACESSOU_PRO:
 # Configurações
 COLUNAS_DEZENAS = ['B1', 'B2', 'B3', 'B4', 'B5', 'B6']
 FILE_PATH = "MegaSena.xlsx"
+CAMINHO_BANCO_JOGOS = "jogos_mega.db"
+ARQUIVO_PERFIL = "perfil_mega.jsonl"
+JOGOS_POR_PAGINA = 25
 NUM_DEZENAS_TOTAL = 60
 NUM_DEZENAS_SORTEADAS = 6
 
-# --- Funções Auxiliares (INALTERADAS) ---
-
-def eh_primo(n):
-    if n < 2:
-        return False
-    for i in range(2, int(n**0.5) + 1):
-        if n % i == 0:
-            return False
-    return True
-
-@st.cache_data
 def carregar_dados_do_arquivo(file_path=FILE_PATH):
     try:
         if not os.path.exists(file_path):
             st.warning(f"Arquivo '{file_path}' não encontrado.")
             return pd.DataFrame(), 0, 0
             
-        if file_path.lower().endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-            
-        # Adicionei uma verificação mais robusta para garantir que o Concurso seja o índice
-        colunas_identificadas = df.columns[:8].tolist()
-        if len(colunas_identificadas) < 8:
-            st.error("Estrutura do Excel incorreta. Esperado no mínimo 8 colunas (Concurso, Data, B1..B6).")
-            return pd.DataFrame(), 0, 0
-            
-        df = df.iloc[:, 0:8].fillna(0)
-        df.columns = ['Concurso', 'Data'] + COLUNAS_DEZENAS
-        df = df.set_index('Concurso')
-        df[COLUNAS_DEZENAS] = df[COLUNAS_DEZENAS].astype(int)
+        # Usa o cache colunar em .cache_mega/ e só reprocessa o Excel quando ele muda
+        df = carregar_tabela(file_path)
             
         concurso_min = df.index.min()
         concurso_max = df.index.max()
             
         return df, concurso_min, concurso_max
+    except ValueError as e:
+        st.error(str(e))
+        return pd.DataFrame(), 0, 0
     except Exception as e:
         st.error(f"Erro ao carregar: {e}")
         return pd.DataFrame(), 0, 0
 
-def get_frequencia_e_atraso(df_completo, df_base_completa=None):
-    if df_base_completa is None:
-        df_base_completa = df_completo
-        
-    todas_dezenas = df_completo[COLUNAS_DEZENAS].values.flatten()
-    frequencia_no_periodo = pd.Series(todas_dezenas).loc[lambda x: x > 0].value_counts().reset_index()
-    frequencia_no_periodo.columns = ['Dezena', 'Vezes']
-        
-    dezenas_completas = pd.DataFrame({'Dezena': range(1, NUM_DEZENAS_TOTAL + 1)})
-    df_frequencia = pd.merge(dezenas_completas, frequencia_no_periodo, on='Dezena', how='left').fillna(0)
-    df_frequencia['Vezes'] = df_frequencia['Vezes'].astype(int)
-        
-    ultimo_concurso = df_base_completa.index.max()
-    atrasos = []
-    for dezena in df_frequencia['Dezena']:
-        concursos_saida = df_base_completa[(df_base_completa[COLUNAS_DEZENAS] == dezena).any(axis=1)].index.tolist()
-        if concursos_saida:
-            atraso = ultimo_concurso - max(concursos_saida)
-        else:
-            atraso = len(df_base_completa)
-        atrasos.append(atraso)
-    df_frequencia['Atraso'] = atrasos
-    df_frequencia['Atraso'] = df_frequencia['Atraso'].astype(int)
-        
-    return df_frequencia
-
-# ... (Funções calcular_frequencia_pares, calcular_frequencia_trios, analisar_padroes_avancados,
-# calcular_atraso_dezena, analisar_sequencias_dezenas são mantidas) ...
-
-# Funções de Pares/Trios/Padrões (Mantidas, omitidas para brevidade, mas devem estar no seu arquivo .py)
-def calcular_frequencia_pares(df_analise):
-    todos_pares = []
-    for _, row in df_analise[COLUNAS_DEZENAS].iterrows():
-        dezenas_sorteadas = [d for d in row.tolist() if d > 0]
-        for par in combinations(sorted(dezenas_sorteadas), 2):
-            todos_pares.append(par)
-    contagem_pares = Counter(todos_pares)
-    df_pares = pd.DataFrame(contagem_pares.items(), columns=['Par', 'Frequencia'])
-    df_pares['Dezena 1'] = df_pares['Par'].apply(lambda x: x[0])
-    df_pares['Dezena 2'] = df_pares['Par'].apply(lambda x: x[1])
-    return df_pares.sort_values(by='Frequencia', ascending=False)
-
-def calcular_frequencia_trios(df_analise):
-    todos_trios = []
-    for _, row in df_analise[COLUNAS_DEZENAS].iterrows():
-        dezenas_sorteadas = [d for d in row.tolist() if d > 0]
-        for trio in combinations(sorted(dezenas_sorteadas), 3):
-            todos_trios.append(trio)
-    contagem_trios = Counter(todos_trios)
-    df_trios = pd.DataFrame(contagem_trios.items(), columns=['Trio', 'Frequencia'])
-    df_trios['D1'] = df_trios['Trio'].apply(lambda x: x[0])
-    df_trios['D2'] = df_trios['Trio'].apply(lambda x: x[1])
-    df_trios['D3'] = df_trios['Trio'].apply(lambda x: x[2])
-    return df_trios.sort_values(by='Frequencia', ascending=False)
-
-def analisar_padroes_avancados(df_analise):
-    resultados = []
-    for _, row in df_analise[COLUNAS_DEZENAS].iterrows():
-        dezenas = [d for d in row.tolist() if d > 0]
-        pares = sum(1 for d in dezenas if d % 2 == 0)
-        impares = len(dezenas) - pares
-        primos = sum(1 for d in dezenas if eh_primo(d))
-        soma = sum(dezenas)
-            
-        resultados.append({
-            'Pares': pares,
-            'Impares': impares,
-            'Primos': primos,
-            'Soma': soma
-        })
-            
-    df_padroes = pd.DataFrame(resultados)
-    return {
-        'Pares_Medio': df_padroes['Pares'].mean(),
-        'Impares_Medio': df_padroes['Impares'].mean(),
-        'Primos_Medio': df_padroes['Primos'].mean(),
-        'Soma_Media': df_padroes['Soma'].mean()
-    }
-
-def analisar_sequencias_dezenas(df_completo, dezena_referencia, top_n=15):
-    concursos_com_dezena = df_completo[(df_completo[COLUNAS_DEZENAS] == dezena_referencia).any(axis=1)].index.tolist()
-        
-    if not concursos_com_dezena:
-        return pd.DataFrame()
-        
-    concursos_seguintes = [c + 1 for c in concursos_com_dezena if c + 1 in df_completo.index]
-        
-    if not concursos_seguintes:
-        return pd.DataFrame()
-        
-    dezenas_seguintes = []
-    for concurso in concursos_seguintes:
-        for col in COLUNAS_DEZENAS:
-            dez = df_completo.loc[concurso, col]
-            if dez > 0:
-                dezenas_seguintes.append(int(dez))
-        
-    contagem = Counter(dezenas_seguintes)
-    concurso_atual = df_completo.index.max()
-        
-    df_sequencia = pd.DataFrame([
-        {
-            'Dezena': str(dez).zfill(2),
-            'Frequência': freq,
-            'Percentual': (freq / len(concursos_seguintes)) * 100,
-            'Atraso': calcular_atraso_dezena(df_completo, dez, concurso_atual)
-        }
-        for dez, freq in contagem.most_common(top_n)
-    ])
-        
-    return df_sequencia
-
-def calcular_atraso_dezena(df_completo, dezena, concurso_mais_recente):
-    concursos_saida = df_completo[(df_completo[COLUNAS_DEZENAS] == dezena).any(axis=1)].index.tolist()
-    if concursos_saida:
-        return concurso_mais_recente - max(concursos_saida)
-    else:
-        return len(df_completo)
-
-# --- Funções de Geração de Jogos (Estratégias PRO) ---
-
-def gerar_jogo_otimizado(df_freq_e_atraso, num_dezenas=6):
-    df_temp = df_freq_e_atraso.copy()
-    # Ajustando Score: Prioriza Frequência e Atraso (Se você quiser manter o que tinha antes, use: 0.7/0.3)
-    df_temp['Score'] = (df_temp['Vezes'] * 1.5) + (df_temp['Atraso'] * 0.5) 
-    df_sorted = df_temp.sort_values(by='Score', ascending=False)
-    dezenas_selecionadas = df_sorted.head(num_dezenas)['Dezena'].tolist()
-    return sorted([int(d) for d in dezenas_selecionadas])
-
-def gerar_jogo_quentes(df_freq_e_atraso, num_dezenas=6):
-    df_sorted = df_freq_e_atraso.sort_values(by='Vezes', ascending=False)
-    dezenas_selecionadas = df_sorted.head(num_dezenas)['Dezena'].tolist()
-    return sorted([int(d) for d in dezenas_selecionadas])
-
-def gerar_jogo_atrasadas(df_freq_e_atraso, num_dezenas=6):
-    df_sorted = df_freq_e_atraso.sort_values(by='Atraso', ascending=False)
-    dezenas_selecionadas = df_sorted.head(num_dezenas)['Dezena'].tolist()
-    return sorted([int(d) for d in dezenas_selecionadas])
-
-def gerar_jogo_balanceado(df_freq_e_atraso, num_dezenas=6):
-    df_temp = df_freq_e_atraso.copy()
-    metade = num_dezenas // 2
-    df_quentes = df_temp.sort_values(by='Vezes', ascending=False)
-    df_atrasadas = df_temp.sort_values(by='Atraso', ascending=False)
-        
-    dezenas_quentes = df_quentes.head(metade)['Dezena'].tolist()
-    dezenas_atrasadas = df_atrasadas.head(num_dezenas - metade)['Dezena'].tolist()
-        
-    dezenas_selecionadas = list(set(dezenas_quentes + dezenas_atrasadas))
-    if len(dezenas_selecionadas) < num_dezenas:
-        faltam = num_dezenas - len(dezenas_selecionadas)
-        outras = df_temp[~df_temp['Dezena'].isin(dezenas_selecionadas)].head(faltam)['Dezena'].tolist()
-        dezenas_selecionadas.extend(outras)
-        
-    return sorted([int(d) for d in dezenas_selecionadas[:num_dezenas]])
+# As funções de análise (frequência, pares, trios, padrões e sequências) ficam em mega_estatisticas.py
 
-def gerar_jogo_aleatorio_inteligente(df_freq_e_atraso, num_dezenas=6):
-    df_temp = df_freq_e_atraso.copy()
-    # Define um pool de 20 dezenas com base em um Score (Frequência > Atraso)
-    df_temp['Score'] = (df_temp['Vezes'] * 0.7) + (df_temp['Atraso'] * 0.3)
-    df_top = df_temp.sort_values(by='Score', ascending=False).head(20)
-        
-    dezenas_selecionadas = random.sample(df_top['Dezena'].tolist(), min(num_dezenas, len(df_top)))
-    return sorted([int(d) for d in dezenas_selecionadas])
+@st.cache_resource(max_entries=1)
+def obter_publicacao(file_path=FILE_PATH, assinatura=None):
+    # Um histórico por processo, compartilhado só para leitura por todas as sessões (sem cópia por usuário).
+    # A assinatura do arquivo entra na chave: uma planilha atualizada gera um novo histórico.
+    # Concursos novos (mega_ingestao) publicam versões seguintes sem reler a planilha.
+    df, _, _ = carregar_dados_do_arquivo(file_path)
+    return PublicacaoHistorico(file_path, HistoricoMega(df))
+
+@st.cache_resource
+def obter_repositorio_jogos(caminho=CAMINHO_BANCO_JOGOS):
+    # Um banco SQLite por processo: os jogos sobrevivem ao fim da sessão e cada usuário só vê os seus (dono)
+    return RepositorioJogos(caminho)
+
+def obter_dono_jogos():
+    # Identificador do usuário dono dos jogos salvos; fica na URL (?jogador=...) para sobreviver a recarregar a página
+    dono = st.query_params.get('jogador') or st.session_state.get('dono_jogos') or uuid.uuid4().hex
+    st.session_state['dono_jogos'] = dono
+    if st.query_params.get('jogador') != dono:
+        st.query_params['jogador'] = dono
+    return dono
+
+def mostrar_cartoes(**opcoes):
+    # A grade inteira de cartões vai em um único elemento HTML (ver mega_cartoes.py)
+    st.markdown(grade_cartoes(**opcoes), unsafe_allow_html=True)
+
+# As estratégias gerar_jogo_* ficam em mega_estrategias.py e o backtest em mega_backtest.py
+
+# Perfil de desempenho (opcional, ligado no sidebar): mede carga, análises e abas desta execução
+perfil = Perfilador(ativo=st.session_state.get('perfil_ativo', False))
 
 # --- Carregamento de Dados ---
-if 'df_mega_completo' not in st.session_state:
-    st.session_state['df_mega_completo'], st.session_state['concurso_min'], st.session_state['concurso_max'] = carregar_dados_do_arquivo()
-if 'jogos_salvos' not in st.session_state:
-    st.session_state['jogos_salvos'] = []
+# A sessão guarda só os limites da janela (widgets do sidebar); os dados e índices são do processo
+with perfil.medir('carga do histórico') as registro_carga:
+    publicacao = obter_publicacao(FILE_PATH, assinatura_arquivo(FILE_PATH) if os.path.exists(FILE_PATH) else None)
+    # Arquivo de entrada com concursos novos ao lado da planilha: a primeira sessão que o vê publica a versão nova
+    try:
+        resultado_entrada = publicacao.verificar_entrada()
+        if resultado_entrada and resultado_entrada['acrescentados']:
+            st.toast(f"{resultado_entrada['acrescentados']} concurso(s) novo(s) acrescentado(s) ao histórico.")
+    except ValueError as e:
+        st.error(f"Arquivo de concursos novos rejeitado: {e}")
+    historico = publicacao.atual
+    registro_carga['linhas'] = len(historico.concursos)
 
-df_completo = st.session_state['df_mega_completo']
+df_completo = historico.df
+repositorio_jogos = obter_repositorio_jogos()
+dono_jogos = obter_dono_jogos()
+indice_ocorrencias = historico.indice_ocorrencias
+indice_pares = historico.indice_pares
+indice_trios = historico.indice_trios
+indice_transicoes = historico.indice_transicoes
+versao_dados_atual = historico.versao
 
-# Limpar cache a cada execução para garantir dados frescos
+# Resultados de outro histórico (ex.: planilha atualizada) não servem mais
 def limpar_cache_se_necessario():
-    """Força limpeza de cache para análises dependentes de período"""
-    pass
+    """Descarta do cache de análises as entradas de versões antigas dos dados"""
+    if st.session_state.get('versao_cache_validada') != versao_dados_atual:
+        CACHE_ANALISES.invalidar(manter_versao=versao_dados_atual)
+        st.session_state['versao_cache_validada'] = versao_dados_atual
 
 limpar_cache_se_necessario()
 
@@ -271,8 +151,15 @@ if df_completo is not None and not df_completo.empty:
     st.sidebar.header("⚙️ Configurações de Análise")
     st.sidebar.markdown("---")
         
-    concurso_min = st.session_state['concurso_min']
-    concurso_max = st.session_state['concurso_max']
+    concurso_min = historico.concurso_min
+    concurso_max = historico.concurso_max
+    # Com concursos novos publicados, quem estava olhando o último concurso passa a ver o novo último
+    concurso_max_anterior = st.session_state.get('concurso_max_visto')
+    if concurso_max_anterior is not None and concurso_max > concurso_max_anterior:
+        if st.session_state.get('concurso_fim_mega') == concurso_max_anterior:
+            # Sem a chave, o widget volta ao valor padrão (o último concurso)
+            del st.session_state['concurso_fim_mega']
+    st.session_state['concurso_max_visto'] = concurso_max
         
     col_start, col_end = st.sidebar.columns(2)
         
@@ -294,19 +181,126 @@ if df_completo is not None and not df_completo.empty:
         key='concurso_fim_mega'
     )
         
-    df_analise = df_completo[(df_completo.index >= concurso_inicio) & (df_completo.index <= concurso_fim)].copy()
+    pos_inicio, pos_fim = historico.posicoes(concurso_inicio, concurso_fim)
+    df_analise = historico.fatia(pos_inicio, pos_fim)
         
     if df_analise.empty:
         st.warning("Período inválido.")
         st.stop()
         
     num_concursos = len(df_analise)
-    df_freq_e_atraso = get_frequencia_e_atraso(df_analise, df_completo)
+    
+    def analise_em_cache(nome, calcular, *parametros, janela=None):
+        # Compartilhado entre sessões: os resultados devolvidos não podem ser alterados sem .copy()
+        # `janela` = (concurso inicial, final) para análises que não usam a janela do sidebar
+        inicio, fim = janela or (concurso_inicio, concurso_fim)
+        secao = f"{nome}({', '.join(map(str, parametros))})" if parametros else nome
+        with perfil.medir(secao, linhas=num_concursos if janela is None else None) as registro:
+            valor, acertou = CACHE_ANALISES.obter_com_status(
+                chave_analise(versao_dados_atual, inicio, fim, nome, *parametros), calcular
+            )
+            registro['cache'] = 'acerto' if acertou else 'falha'
+        return valor
+    
+    df_freq_e_atraso = analise_em_cache(
+        'frequencia_e_atraso', lambda: indice_ocorrencias.frequencia_e_atraso(concurso_inicio, concurso_fim)
+    )
+    
+    with st.sidebar.expander("🎲 Significância (Monte Carlo)"):
+        st.checkbox("Comparar quentes, frias e pares com o acaso", key='comparar_acaso')
+        simulacoes_acaso = st.selectbox("Históricos simulados:", options=[1000, 5000, SIMULACOES_PADRAO], index=2, key='simulacoes_acaso')
+        st.caption("Sorteia históricos aleatórios do mesmo tamanho da janela e mede quantas vezes o acaso produz números tão extremos (p-valor). O atraso testado é o medido dentro da janela.")
+    
+    def obter_distribuicao_acaso():
+        """Distribuição sob o acaso da janela atual, ou None se a comparação estiver desligada"""
+        if not st.session_state.get('comparar_acaso'):
+            return None
+        with st.spinner(f"Simulando {simulacoes_acaso:,} históricos aleatórios..."):
+            # Só depende do tamanho da janela: a chave não leva os limites, então janelas do mesmo tamanho a compartilham
+            return analise_em_cache(
+                'simulacao_acaso', lambda: simular_acaso(num_concursos, simulacoes_acaso), num_concursos, simulacoes_acaso, janela=(0, 0)
+            )
+    
+    def obter_atraso_na_janela():
+        """Atraso de cada dezena (1 a 60) contando só os concursos da janela, o que a simulação mede"""
+        return analise_em_cache(
+            'atraso_na_janela', lambda: indice_ocorrencias.atraso_na_janela(concurso_inicio, concurso_fim)[1:]
+        )
+    
+    with st.sidebar.expander("📥 Novos Concursos"):
+        arquivo_novos = st.file_uploader(
+            "CSV ou JSON só com os concursos novos (Concurso, Data, B1..B6):", type=['csv', 'json'], key='arquivo_novos_concursos'
+        )
+        if st.button("Acrescentar ao histórico", key='acrescentar_concursos', disabled=arquivo_novos is None):
+            try:
+                formato = os.path.splitext(arquivo_novos.name)[1]
+                resultado = publicacao.acrescentar(ler_novos_concursos(arquivo_novos, formato))
+            except (ValueError, KeyError, TypeError) as e:
+                st.error(f"Concursos não acrescentados: {e}")
+            else:
+                st.session_state['resultado_novos_concursos'] = resultado
+                st.rerun()
+        resultado = st.session_state.pop('resultado_novos_concursos', None)
+        if resultado is not None:
+            st.success(
+                f"{resultado['acrescentados']} concurso(s) acrescentado(s), {resultado['ignorados']} já existente(s)."
+                + ("" if resultado['gravado'] or not resultado['acrescentados'] else " Não foi possível gravar em disco: valem até o app reiniciar.")
+            )
+        st.caption(
+            f"Também é possível deixar {' ou '.join(ARQUIVOS_ENTRADA)} na pasta da planilha: "
+            "o arquivo é acrescentado no próximo carregamento de qualquer sessão. As outras sessões veem os concursos novos no próximo rerun."
+        )
+    
+    with st.sidebar.expander("🗄️ Cache de Análises"):
+        estatisticas_cache = CACHE_ANALISES.estatisticas()
+        st.caption(
+            f"{estatisticas_cache['itens']} resultados · {estatisticas_cache['bytes'] / 2**20:.1f} MB · "
+            f"acertos {estatisticas_cache['acertos']} / falhas {estatisticas_cache['falhas']} "
+            f"({estatisticas_cache['taxa_acerto']:.0%}) · despejos {estatisticas_cache['despejos']}"
+        )
+    
+    with st.sidebar.expander("⏱️ Perfil de Desempenho"):
+        st.checkbox("Medir as execuções desta sessão", key='perfil_ativo')
+        st.checkbox(f"Gravar cada execução em {ARQUIVO_PERFIL}", key='perfil_exportar')
+        # Preenchido no fim do script com a carga e o sidebar; cada aba mostra o próprio perfil no fim dela
+        painel_perfil = st.empty()
+    
+    def exportar_perfil(perfil_execucao, trecho):
+        if st.session_state.get('perfil_exportar'):
+            perfil_execucao.exportar(
+                ARQUIVO_PERFIL, trecho=trecho, janela=[int(concurso_inicio), int(concurso_fim)], num_concursos=num_concursos
+            )
+    
+    def fragmento_com_perfil(nome_aba):
+        """@st.fragment com um Perfilador próprio por execução da aba.
+
+        Um rerun só da aba não passa pelo script, então a aba é medida, exibida e
+        exportada dentro do próprio fragmento; enquanto ele roda, `perfil` (usado por
+        analise_em_cache) aponta para o Perfilador da aba.
+        """
+        def decorar(renderizar):
+            @st.fragment
+            @functools.wraps(renderizar)
+            def fragmento():
+                global perfil
+                perfil_script = perfil
+                perfil = Perfilador(ativo=st.session_state.get('perfil_ativo', False))
+                try:
+                    with perfil.medir(f'aba: {nome_aba}'):
+                        renderizar()
+                    if perfil.ativo:
+                        with st.expander(f"⏱️ Perfil da aba: {perfil.total() * 1000:.0f} ms"):
+                            st.dataframe(perfil.tabela(), use_container_width=True, hide_index=True)
+                        exportar_perfil(perfil, f'aba: {nome_aba}')
+                finally:
+                    perfil = perfil_script
+            return fragmento
+        return decorar
     
     # ----------------------------------------------------------------------------------
     # [NOVO] DEFINIÇÃO DE ABAS CONDICIONAL
     # ----------------------------------------------------------------------------------
-    abas_basicas = ["📊 Dashboard", "🔍 Análises Avançadas", "🔗 Pares e Trios", "🌡️ Ciclos", "🎯 Sequências"]
+    abas_basicas = ["📊 Dashboard", "🔍 Análises Avançadas", "🔗 Pares e Trios", "🌡️ Ciclos", "🎯 Sequências", "📈 Tendências"]
 
     abas_pro_nomes = []
     if ACESSOU_PRO: # Agora essa verificação é crucial
@@ -321,18 +315,20 @@ if df_completo is not None and not df_completo.empty:
     tab_pares_trios = abas[2]
     tab_ciclos = abas[3]
     tab_sequencias = abas[4]
+    tab_tendencias = abas[5]
 
     # Condicionalmente define as abas PRO
-    tab_estrategias = abas[5] if "🎲 Estratégias" in nomes_abas_completos else None
-    tab_geradores = abas[6] if "🚀 Geradores" in nomes_abas_completos else None
-    tab_meus_jogos = abas[7] if "💾 Meus Jogos PRO" in nomes_abas_completos else None
+    tab_estrategias = abas[6] if "🎲 Estratégias" in nomes_abas_completos else None
+    tab_geradores = abas[7] if "🚀 Geradores" in nomes_abas_completos else None
+    tab_meus_jogos = abas[8] if "💾 Meus Jogos PRO" in nomes_abas_completos else None
     # ----------------------------------------------------------------------------------
 
 
     # =================================================================
     # TAB: DASHBOARD
     # =================================================================
-    with tab_dashboard:
+    @fragmento_com_perfil('Dashboard')
+    def renderizar_aba_dashboard():
         st.header("📊 Dashboard Principal")
         st.info(f"Análise baseada em {num_concursos} concursos (#{concurso_inicio} a #{concurso_fim})")
             
@@ -360,49 +356,39 @@ if df_completo is not None and not df_completo.empty:
             st.subheader("🔥 Top 10 Mais Frequentes")
             top_freq = df_freq_e_atraso.sort_values(by='Vezes', ascending=False).head(10)
                 
-            for _, row in top_freq.iterrows():
-                dezena = int(row['Dezena'])
-                st.markdown(f"""
-                <div style="
-                    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                    padding: 10px;
-                    border-radius: 8px;
-                    margin: 5px 0;
-                    color: white;
-                    display: flex;
-                    justify-content: space-between;
-                ">
-                    <div style="font-size: 24px; font-weight: bold;">{dezena:02d}</div>
-                    <div style="text-align: right;">
-                        <div>Frequência: {int(row['Vezes'])}</div>
-                        <div style="font-size: 12px;">Atraso: {int(row['Atraso'])}</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            mostrar_cartoes(
+                titulos=top_freq['Dezena'].map('{:02d}'.format),
+                detalhes='Frequência: ' + top_freq['Vezes'].astype(str),
+                rodapes='Atraso: ' + top_freq['Atraso'].astype(str),
+                gradiente='rosa',
+            )
             
         with col_top2:
             st.subheader("❄️ Top 10 Mais Atrasadas")
             top_atraso = df_freq_e_atraso.sort_values(by='Atraso', ascending=False).head(10)
+            # Intervalos entre aparições no histórico inteiro, como o atraso
+            df_intervalos = analise_em_cache(
+                'tabela_intervalos', historico.indice_intervalos.tabela, janela=(concurso_min, concurso_max)
+            )
+            intervalos_top = df_intervalos.set_index('Dezena').loc[top_atraso['Dezena']]
                 
-            for _, row in top_atraso.iterrows():
-                dezena = int(row['Dezena'])
-                st.markdown(f"""
-                <div style="
-                    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                    padding: 10px;
-                    border-radius: 8px;
-                    margin: 5px 0;
-                    color: white;
-                    display: flex;
-                    justify-content: space-between;
-                ">
-                    <div style="font-size: 24px; font-weight: bold;">{dezena:02d}</div>
-                    <div style="text-align: right;">
-                        <div>Atraso: {int(row['Atraso'])}</div>
-                        <div style="font-size: 12px;">Freq: {int(row['Vezes'])}</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            mostrar_cartoes(
+                titulos=top_atraso['Dezena'].map('{:02d}'.format),
+                detalhes='Atraso: ' + top_atraso['Atraso'].astype(str),
+                rodapes=(
+                    'Freq: ' + top_atraso['Vezes'].astype(str)
+                    + ' | supera ' + intervalos_top['Percentil do Atraso'].fillna(0).map('{:.0f}%'.format).to_numpy()
+                    + ' dos intervalos (recorde ' + intervalos_top['Intervalo Máximo'].astype(str).to_numpy() + ')'
+                ),
+                gradiente='azul',
+            )
+            with st.expander("📏 Intervalos entre Aparições"):
+                st.caption("Intervalo = concursos entre duas aparições seguidas da dezena, em todo o histórico. 'Percentil do Atraso' = % dos intervalos passados que o atraso atual já igualou ou superou.")
+                st.dataframe(
+                    df_intervalos.sort_values(by='Percentil do Atraso', ascending=False),
+                    use_container_width=True,
+                    hide_index=True
+                )
             
         st.markdown("---")
             
@@ -415,15 +401,44 @@ if df_completo is not None and not df_completo.empty:
             labels={'Dezena': 'Dezena', 'Vezes': 'Frequência'}
         )
         fig_freq.update_traces(marker_color='#667eea')
+        distribuicao_acaso = obter_distribuicao_acaso()
+        if distribuicao_acaso is not None:
+            faixa = distribuicao_acaso.faixa_vezes()
+            fig_freq.add_hline(y=faixa['media'], line_dash='solid', line_color='gray', annotation_text='Esperado')
+            for y, rotulo in ((faixa['inferior'], '95% (dezena)'), (faixa['superior'], '95% (dezena)')):
+                fig_freq.add_hline(y=y, line_dash='dash', line_color='orange', annotation_text=rotulo)
+            for y, rotulo in ((faixa['inferior_simultanea'], '95% (todas)'), (faixa['superior_simultanea'], '95% (todas)')):
+                fig_freq.add_hline(y=y, line_dash='dot', line_color='red', annotation_text=rotulo)
         st.plotly_chart(fig_freq, use_container_width=True)
+            
+        if distribuicao_acaso is not None:
+            df_significancia = tabela_significancia(distribuicao_acaso, df_freq_e_atraso, obter_atraso_na_janela())
+            destaques = df_significancia[
+                (df_significancia['p Quente (ajustado)'] < 0.05) | (df_significancia['p Fria (ajustado)'] < 0.05)
+                | (df_significancia['p Atraso (ajustado)'] < 0.05)
+            ]
+            if destaques.empty:
+                st.success(f"Nenhuma dezena foge do acaso considerando as 60 juntas ({distribuicao_acaso.simulacoes:,} simulações): as diferenças de frequência e atraso são compatíveis com sorteios aleatórios.")
+            else:
+                st.warning(f"{len(destaques)} dezena(s) fogem do acaso mesmo considerando as 60 juntas (p ajustado < 0,05).")
+            with st.expander("📋 p-valores por dezena"):
+                st.caption("Linhas tracejadas: faixa de 95% para uma dezena isolada. Pontilhadas: faixa de 95% para a mais alta/mais baixa das 60. As colunas 'ajustado' já descontam o fato de olharmos 60 dezenas ao mesmo tempo. 'p Atraso' testa o Atraso na Janela (concursos da janela desde a última saída), que é o que a simulação mede.")
+                st.dataframe(df_significancia, use_container_width=True, hide_index=True)
+
+    with tab_dashboard:
+        renderizar_aba_dashboard()
         
     # =================================================================
     # TAB: ANÁLISES
     # =================================================================
-    with tab_analises:
+    @fragmento_com_perfil('Análises Avançadas')
+    def renderizar_aba_analises():
         st.header("🔍 Análises Avançadas")
             
-        padroes = analisar_padroes_avancados(df_analise)
+        padroes = analise_em_cache(
+            'padroes_avancados',
+            lambda: resumir_padroes(historico.concursos[pos_inicio:pos_fim], historico.dezenas[pos_inicio:pos_fim]),
+        )
             
         st.subheader("📊 Padrões Estatísticos Médios")
             
@@ -440,127 +455,213 @@ if df_completo is not None and not df_completo.empty:
             
         st.markdown("---")
             
+        st.subheader("📈 Distribuições por Concurso")
+            
         col_g1, col_g2 = st.columns(2)
             
         with col_g1:
-            fig_paridade = go.Figure(data=[go.Pie(
-                labels=['Pares', 'Ímpares'],
-                values=[padroes['Pares_Medio'], padroes['Impares_Medio']],
-                marker=dict(colors=['#667eea', '#764ba2'])
-            )])
-            fig_paridade.update_layout(title='Distribuição: Pares vs Ímpares')
+            fig_paridade = px.bar(
+                padroes['Dist_Pares'],
+                x='Pares',
+                y='Concursos',
+                title='Quantidade de Dezenas Pares por Concurso',
+                labels={'Pares': 'Dezenas pares no sorteio'}
+            )
+            fig_paridade.update_traces(marker_color='#667eea')
             st.plotly_chart(fig_paridade, use_container_width=True)
             
         with col_g2:
-            fig_primos = go.Figure(data=[go.Pie(
-                labels=['Primos', 'Não-Primos'],
-                values=[padroes['Primos_Medio'], 6 - padroes['Primos_Medio']],
-                marker=dict(colors=['#f093fb', '#f5576c'])
-            )])
-            fig_primos.update_layout(title='Distribuição: Primos vs Não-Primos')
+            fig_primos = px.bar(
+                padroes['Dist_Primos'],
+                x='Primos',
+                y='Concursos',
+                title='Quantidade de Primos por Concurso',
+                labels={'Primos': 'Primos no sorteio'}
+            )
+            fig_primos.update_traces(marker_color='#f5576c')
             st.plotly_chart(fig_primos, use_container_width=True)
             
+        col_g3, col_g4 = st.columns(2)
+            
+        with col_g3:
+            fig_soma = px.bar(
+                padroes['Dist_Soma'],
+                x='Soma',
+                y='Concursos',
+                title='Soma das Dezenas (faixas de 10)',
+                labels={'Soma': 'Início da faixa'}
+            )
+            fig_soma.update_traces(marker_color='#764ba2')
+            st.plotly_chart(fig_soma, use_container_width=True)
+            
+        with col_g4:
+            fig_decadas = px.bar(
+                padroes['Dist_Decadas'],
+                x='Decadas',
+                y='Concursos',
+                title='Décadas Diferentes por Concurso',
+                labels={'Decadas': 'Décadas ocupadas (01-10, 11-20, ...)'}
+            )
+            fig_decadas.update_traces(marker_color='#4facfe')
+            st.plotly_chart(fig_decadas, use_container_width=True)
+            
         st.markdown("---")
             
         st.subheader("📋 Tabela Completa")
         df_display = df_freq_e_atraso.copy()
         df_display['Dezena Formatada'] = df_display['Dezena'].apply(lambda x: f'{int(x):02d}')
         df_display['Par/Ímpar'] = df_display['Dezena'].apply(lambda x: 'Par' if x % 2 == 0 else 'Ímpar')
-        df_display['Primo'] = df_display['Dezena'].apply(lambda x: 'Sim' if eh_primo(int(x)) else 'Não')
+        df_display['Primo'] = ['Sim' if primo else 'Não' for primo in EH_PRIMO[df_display['Dezena'].to_numpy()]]
             
         st.dataframe(
             df_display[['Dezena Formatada', 'Vezes', 'Atraso', 'Par/Ímpar', 'Primo']].sort_values(by='Vezes', ascending=False),
             use_container_width=True,
             hide_index=True
         )
+
+    with tab_analises:
+        renderizar_aba_analises()
         
     # =================================================================
     # TAB: PARES E TRIOS
     # =================================================================
-    with tab_pares_trios:
+    @fragmento_com_perfil('Pares e Trios')
+    def renderizar_aba_pares_trios():
         st.header("🔗 Análise de Pares e Trios")
             
         if len(df_analise) >= 2:
             st.subheader("👥 Top 20 Pares Mais Frequentes")
-            df_pares = calcular_frequencia_pares(df_analise)
+            contagens_pares = analise_em_cache('contagens_pares', lambda: indice_pares.contagens(pos_inicio, pos_fim))
+            df_pares = analise_em_cache('tabela_pares', lambda: tabela_pares(contagens_pares, top_n=50), 50)
             top_20_pares = df_pares.head(20)
                 
-            cols_pares = st.columns(4)
-            for idx, (_, row) in enumerate(top_20_pares.iterrows()):
-                col_idx = idx % 4
-                with cols_pares[col_idx]:
-                    st.markdown(f"""
-                    <div style="
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        padding: 15px;
-                        border-radius: 10px;
-                        text-align: center;
-                        color: white;
-                        margin: 5px 0;
-                    ">
-                        <div style="font-size: 10px;">#{idx+1}</div>
-                        <div style="font-size: 20px; font-weight: bold;">{int(row['Dezena 1']):02d} - {int(row['Dezena 2']):02d}</div>
-                        <div style="font-size: 14px;">↑ {int(row['Frequencia'])}x</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+            mostrar_cartoes(
+                titulos=top_20_pares['Dezena 1'].map('{:02d}'.format) + ' - ' + top_20_pares['Dezena 2'].map('{:02d}'.format),
+                detalhes='↑ ' + top_20_pares['Frequencia'].astype(str) + 'x',
+                gradiente='roxo', colunas=4, layout='centro', tamanho_titulo=20,
+            )
                 
             with st.expander("📋 Ver Top 50 Pares"):
                 df_pares_display = df_pares.head(50).copy()
                 df_pares_display['Par'] = df_pares_display.apply(lambda r: f"{int(r['Dezena 1']):02d} - {int(r['Dezena 2']):02d}", axis=1)
-                st.dataframe(df_pares_display[['Par', 'Frequencia']], use_container_width=True, hide_index=True)
+                colunas_pares = ['Par', 'Frequencia']
+                distribuicao_acaso = obter_distribuicao_acaso()
+                if distribuicao_acaso is not None:
+                    df_pares_display = adicionar_p_valores_pares(distribuicao_acaso, df_pares_display)
+                    colunas_pares += ['p Par', 'p Par (ajustado)']
+                    st.caption("p Par (ajustado): chance de o par mais frequente entre os 1770 sair tantas vezes só por acaso.")
+                st.dataframe(df_pares_display[colunas_pares], use_container_width=True, hide_index=True)
+                
+            with st.expander("🗺️ Mapa de Calor dos Pares"):
+                dezenas_eixo = [f'{d:02d}' for d in range(1, NUM_DEZENAS_TOTAL + 1)]
+                fig_mapa_pares = px.imshow(
+                    matriz_pares(contagens_pares),
+                    x=dezenas_eixo,
+                    y=dezenas_eixo,
+                    color_continuous_scale='Purples',
+                    labels={'x': 'Dezena', 'y': 'Dezena', 'color': 'Vezes juntas'},
+                    title='Coocorrência de Todas as Dezenas'
+                )
+                fig_mapa_pares.update_layout(height=700)
+                st.plotly_chart(fig_mapa_pares, use_container_width=True)
                 
             st.markdown("---")
                 
             st.subheader("👨‍👩‍👦 Top 15 Trios Mais Frequentes")
                 
-            with st.spinner("Calculando trios..."):
-                df_trios = calcular_frequencia_trios(df_analise)
-                top_15_trios = df_trios.head(15)
-                    
-                cols_trios = st.columns(3)
-                for idx, (_, row) in enumerate(top_15_trios.iterrows()):
-                    col_idx = idx % 3
-                    with cols_trios[col_idx]:
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                            padding: 15px;
-                            border-radius: 10px;
-                            text-align: center;
-                            color: white;
-                            margin: 5px 0;
-                        ">
-                            <div style="font-size: 10px;">#{idx+1}</div>
-                            <div style="font-size: 18px; font-weight: bold;">{int(row['D1']):02d} - {int(row['D2']):02d} - {int(row['D3']):02d}</div>
-                            <div style="font-size: 14px;">↑ {int(row['Frequencia'])}x</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+            df_trios = analise_em_cache(
+                'tabela_trios', lambda: tabela_trios(indice_trios.contagens(pos_inicio, pos_fim), top_n=15), 15
+            )
+            top_15_trios = df_trios.head(15)
+                
+            mostrar_cartoes(
+                titulos=(
+                    top_15_trios['D1'].map('{:02d}'.format) + ' - ' + top_15_trios['D2'].map('{:02d}'.format)
+                    + ' - ' + top_15_trios['D3'].map('{:02d}'.format)
+                ),
+                detalhes='↑ ' + top_15_trios['Frequencia'].astype(str) + 'x',
+                gradiente='rosa', colunas=3, layout='centro', tamanho_titulo=18,
+            )
         else:
             st.warning("Período de análise muito curto para calcular pares e trios.")
+
+    with tab_pares_trios:
+        renderizar_aba_pares_trios()
         
     # =================================================================
     # TAB: CICLOS
     # =================================================================
-    with tab_ciclos:
+    @fragmento_com_perfil('Ciclos')
+    def renderizar_aba_ciclos():
         st.header("🌡️ Análise de Ciclos")
             
+        # Ciclo das dezenas: concursos até as 60 saírem, em todo o histórico (índice montado na carga)
+        st.subheader("🔄 Ciclo das Dezenas")
+        indice_ciclos = historico.indice_ciclos
+        faltantes = indice_ciclos.faltantes()
+        df_historico_ciclos = analise_em_cache('tabela_ciclos', indice_ciclos.tabela, janela=(concurso_min, concurso_max))
+            
+        col_ci1, col_ci2, col_ci3, col_ci4 = st.columns(4)
+        with col_ci1:
+            st.metric("Ciclo Atual Começou em", f"#{indice_ciclos.inicio_aberto}" if indice_ciclos.inicio_aberto is not None else "—")
+        with col_ci2:
+            st.metric("Concursos no Ciclo Atual", indice_ciclos.duracao_aberta)
+        with col_ci3:
+            st.metric("Dezenas Faltando", f"{len(faltantes)}/{NUM_DEZENAS_TOTAL}")
+        with col_ci4:
+            st.metric("Duração Média (ciclos fechados)", f"{df_historico_ciclos['Concursos'].mean():.1f}" if not df_historico_ciclos.empty else "—")
+            
+        if indice_ciclos.inicio_aberto is not None and faltantes:
+            st.markdown("**Faltam sair no ciclo atual:**")
+            mostrar_cartoes(
+                titulos=[f'{d:02d}' for d in faltantes],
+                detalhes=[f'Atraso: {historico.indice_intervalos.atraso(d)}' for d in faltantes],
+                gradiente='azul', colunas=min(6, len(faltantes)), layout='centro', tamanho_titulo=20,
+                rotulos=[''] * len(faltantes),
+            )
+        elif indice_ciclos.inicio_aberto is None:
+            st.success("O último concurso fechou um ciclo: o próximo sorteio começa um ciclo novo.")
+            
+        if not df_historico_ciclos.empty:
+            fig_ciclos = px.bar(
+                df_historico_ciclos,
+                x='Fim',
+                y='Concursos',
+                hover_data=['Ciclo', 'Início'],
+                title='Duração de Cada Ciclo (concursos até sair as 60 dezenas)',
+                labels={'Fim': 'Concurso em que o ciclo fechou', 'Concursos': 'Duração'}
+            )
+            fig_ciclos.update_traces(marker_color='#764ba2')
+            fig_ciclos.add_hline(y=df_historico_ciclos['Concursos'].mean(), line_dash='dash', line_color='gray', annotation_text='Média')
+            st.plotly_chart(fig_ciclos, use_container_width=True)
+            with st.expander("📋 Ver Todos os Ciclos"):
+                st.dataframe(df_historico_ciclos.iloc[::-1], use_container_width=True, hide_index=True)
+            
+        st.markdown("---")
+        st.subheader("🌡️ Quentes e Frias no Período")
+            
         media_freq = df_freq_e_atraso['Vezes'].mean()
         media_atraso = df_freq_e_atraso['Atraso'].mean()
             
         df_ciclos = df_freq_e_atraso.copy()
-            
-        def classificar_ciclo(row):
-            if row['Vezes'] >= media_freq and row['Atraso'] <= media_atraso:
-                return '🔥 Muito Quente'
-            elif row['Vezes'] >= media_freq:
-                return '🟠 Quente'
-            elif row['Atraso'] >= media_atraso:
-                return '❄️ Fria'
-            else:
-                return '🔵 Neutro'
-            
-        df_ciclos['Ciclo'] = df_ciclos.apply(classificar_ciclo, axis=1)
+        quente = df_ciclos['Vezes'] >= media_freq
+        df_ciclos['Ciclo'] = np.select(
+            [quente & (df_ciclos['Atraso'] <= media_atraso), quente, df_ciclos['Atraso'] >= media_atraso],
+            ['🔥 Muito Quente', '🟠 Quente', '❄️ Fria'],
+            default='🔵 Neutro'
+        )
         df_ciclos['Dezena Formatada'] = df_ciclos['Dezena'].apply(lambda x: f'{int(x):02d}')
+        distribuicao_acaso = obter_distribuicao_acaso()
+        if distribuicao_acaso is not None:
+            df_ciclos = distribuicao_acaso.p_valores_dezenas(df_ciclos, obter_atraso_na_janela())
+            
+        def rodape_ciclo(df, coluna_p):
+            rodape = 'Freq: ' + df['Vezes'].astype(str) + ' | Atraso: ' + df['Atraso'].astype(str)
+            if coluna_p in df:
+                if coluna_p == 'p Atraso':
+                    rodape += ' (na janela: ' + df['Atraso na Janela'].astype(str) + ')'
+                rodape += ' | p: ' + df[coluna_p].map('{:.3f}'.format)
+            return rodape
             
         col_c1, col_c2 = st.columns(2)
             
@@ -569,90 +670,60 @@ if df_completo is not None and not df_completo.empty:
             df_quentes = df_ciclos[df_ciclos['Ciclo'].isin(['🔥 Muito Quente', '🟠 Quente'])].sort_values(by='Vezes', ascending=False).head(15)
                 
             if not df_quentes.empty:
-                for _, row in df_quentes.iterrows():
-                    st.markdown(f"""
-                    <div style="
-                        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a6f 100%);
-                        padding: 10px;
-                        border-radius: 8px;
-                        margin: 5px 0;
-                        color: white;
-                        display: flex;
-                        justify-content: space-between;
-                    ">
-                        <div style="font-size: 20px; font-weight: bold;">{row['Dezena Formatada']}</div>
-                        <div style="text-align: right;">
-                            <div>{row['Ciclo']}</div>
-                            <div style="font-size: 12px;">Freq: {int(row['Vezes'])} | Atraso: {int(row['Atraso'])}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                mostrar_cartoes(
+                    titulos=df_quentes['Dezena Formatada'],
+                    detalhes=df_quentes['Ciclo'],
+                    rodapes=rodape_ciclo(df_quentes, 'p Quente'),
+                    gradiente='vermelho', tamanho_titulo=20,
+                )
             
         with col_c2:
             st.subheader("❄️ Dezenas Frias")
             df_frias = df_ciclos[df_ciclos['Ciclo'] == '❄️ Fria'].sort_values(by='Atraso', ascending=False).head(15)
                 
             if not df_frias.empty:
-                for _, row in df_frias.iterrows():
-                    st.markdown(f"""
-                    <div style="
-                        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                        padding: 10px;
-                        border-radius: 8px;
-                        margin: 5px 0;
-                        color: white;
-                        display: flex;
-                        justify-content: space-between;
-                    ">
-                        <div style="font-size: 20px; font-weight: bold;">{row['Dezena Formatada']}</div>
-                        <div style="text-align: right;">
-                            <div>{row['Ciclo']}</div>
-                            <div style="font-size: 12px;">Freq: {int(row['Vezes'])} | Atraso: {int(row['Atraso'])}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                mostrar_cartoes(
+                    titulos=df_frias['Dezena Formatada'],
+                    detalhes=df_frias['Ciclo'],
+                    rodapes=rodape_ciclo(df_frias, 'p Atraso'),
+                    gradiente='azul', tamanho_titulo=20,
+                )
+
+    with tab_ciclos:
+        renderizar_aba_ciclos()
         
     # =================================================================
     # TAB: SEQUÊNCIAS
     # =================================================================
-    with tab_sequencias:
+    @fragmento_com_perfil('Sequências')
+    def renderizar_aba_sequencias():
         st.header("🎯 Análise de Sequências")
         st.info("Descubra quais dezenas mais aparecem no sorteio seguinte.")
             
-        ultimo_resultado = df_analise[COLUNAS_DEZENAS].iloc[-1].tolist()
-        dezenas_ultimo = sorted([int(d) for d in ultimo_resultado if d > 0])
+        dezenas_ultimo = historico.dezenas_sorteadas(pos_fim - 1)
             
         st.markdown(f"**Último Resultado Analisado:** {' | '.join([str(d).zfill(2) for d in dezenas_ultimo])}")
+        
+        def sequencia_em_cache(dezena):
+            return analise_em_cache(
+                'sequencia', lambda: indice_transicoes.janela(pos_inicio, pos_fim).sequencia(dezena, top_n=15), dezena, 15
+            )
         st.markdown("---")
             
         for idx, dezena_origem in enumerate(dezenas_ultimo):
             st.markdown(f"### Após a Dezena **{dezena_origem:02d}** sair")
                 
-            df_seq = analisar_sequencias_dezenas(df_analise, dezena_origem, top_n=15)
+            df_seq = sequencia_em_cache(dezena_origem)
                 
             if not df_seq.empty:
                 top_6 = df_seq.head(6)
                     
-                cols_top6 = st.columns(6)
-                for i, (_, row) in enumerate(top_6.iterrows()):
-                    dezena_int = int(row['Dezena'])
-                        
-                    with cols_top6[i]:
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                            padding: 20px;
-                            border-radius: 10px;
-                            text-align: center;
-                            color: white;
-                            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                        ">
-                            <div style="font-size: 12px; opacity: 0.9;">#{i+1}</div>
-                            <div style="font-size: 36px; font-weight: bold; margin: 10px 0;">{row['Dezena']}</div>
-                            <div style="font-size: 14px; margin: 5px 0;">↑ {int(row['Frequência'])}x - {row['Percentual']:.1f}%</div>
-                            <div style="font-size: 12px; opacity: 0.8;">Atraso: {int(row['Atraso'])}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                mostrar_cartoes(
+                    titulos=top_6['Dezena'],
+                    detalhes='↑ ' + top_6['Frequência'].astype(str) + 'x - ' + top_6['Percentual'].map('{:.1f}%'.format),
+                    rodapes='Atraso: ' + top_6['Atraso'].astype(str),
+                    gradiente='roxo', colunas=6, layout='centro', tamanho_titulo=36,
+                )
                         
                 with st.expander(f"📋 Ver Top 15 completo - Dezena {dezena_origem:02d}"):
                     st.dataframe(df_seq.astype(str), use_container_width=True, hide_index=True)
@@ -667,18 +738,76 @@ if df_completo is not None and not df_completo.empty:
             dezena_busca = st.number_input("Dezena:", min_value=1, max_value=60, value=dezenas_ultimo[0], step=1, key='dezena_busca_seq')
             
         with col_b2:
-            df_seq_busca = analisar_sequencias_dezenas(df_analise, int(dezena_busca), top_n=15)
+            df_seq_busca = sequencia_em_cache(int(dezena_busca))
                 
             if not df_seq_busca.empty:
                 st.dataframe(df_seq_busca.astype(str), use_container_width=True, hide_index=True)
             else:
                 st.warning("Sem dados para esta dezena no período de análise.")
+
+    with tab_sequencias:
+        renderizar_aba_sequencias()
+        
+    # =================================================================
+    # TAB: TENDÊNCIAS
+    # =================================================================
+    @fragmento_com_perfil('Tendências')
+    def renderizar_aba_tendencias():
+        st.header("📈 Tendências: Frequência em Janela Móvel")
+        st.info("Frequência de cada dezena em janelas de N concursos que deslizam por todo o histórico, sem depender do período do sidebar.")
+            
+        total_concursos = len(historico.concursos)
+        col_t1, col_t2 = st.columns(2)
+        with col_t1:
+            largura = st.number_input("Largura da janela (concursos):", min_value=1, max_value=total_concursos, value=min(100, total_concursos), step=10, key='largura_tendencias')
+        with col_t2:
+            passo = st.number_input("Passo entre janelas:", min_value=1, max_value=total_concursos, value=min(10, total_concursos), step=1, key='passo_tendencias')
+            
+        serie = analise_em_cache(
+            'serie_janelas', lambda: indice_ocorrencias.serie_janelas(largura, passo), int(largura), int(passo),
+            janela=(concurso_min, concurso_max)
+        )
+        esperado = largura * NUM_DEZENAS_SORTEADAS / NUM_DEZENAS_TOTAL
+        st.caption(f"{len(serie)} janelas · frequência esperada por janela: {esperado:.1f}")
+            
+        fig_mapa_tendencias = px.imshow(
+            serie.T,
+            x=serie.index,
+            y=[f'{d:02d}' for d in serie.columns],
+            aspect='auto',
+            color_continuous_scale='RdBu_r',
+            color_continuous_midpoint=esperado,
+            labels={'x': 'Concurso (fim da janela)', 'y': 'Dezena', 'color': 'Vezes'},
+            title=f'Frequência por Janela de {largura} Concursos'
+        )
+        fig_mapa_tendencias.update_layout(height=900)
+        st.plotly_chart(fig_mapa_tendencias, use_container_width=True)
+            
+        st.markdown("---")
+        ultima_janela = serie.iloc[-1].sort_values(ascending=False, kind='stable')
+        dezenas_linha = st.multiselect(
+            "Dezenas no gráfico de linhas:",
+            options=list(serie.columns),
+            default=[int(d) for d in ultima_janela.index[:5]],
+            format_func=lambda d: f'{d:02d}',
+            key='dezenas_tendencias'
+        )
+        if dezenas_linha:
+            df_linhas = serie[dezenas_linha].reset_index().melt(id_vars='Concurso', var_name='Dezena', value_name='Vezes')
+            df_linhas['Dezena'] = df_linhas['Dezena'].map('{:02d}'.format)
+            fig_linhas = px.line(df_linhas, x='Concurso', y='Vezes', color='Dezena', title='Evolução da Frequência')
+            fig_linhas.add_hline(y=esperado, line_dash='dash', line_color='gray', annotation_text='Esperado')
+            st.plotly_chart(fig_linhas, use_container_width=True)
+
+    with tab_tendencias:
+        renderizar_aba_tendencias()
         
     # =================================================================
     # [CONDICIONAL] TAB: ESTRATÉGIAS
     # =================================================================
     if tab_estrategias is not None:
-        with tab_estrategias:
+        @fragmento_com_perfil('Estratégias')
+        def renderizar_aba_estrategias():
             st.header("🎲 Estratégias de Jogo (Acesso PRO)")
                 
             num_dez = st.selectbox("Quantidade de dezenas:", options=[6, 7, 8, 9, 10, 12, 15], index=0, key='num_dez_estrategias')
@@ -694,7 +823,7 @@ if df_completo is not None and not df_completo.empty:
                 st.code(jogo_str, language='text')
                 
                 if st.button(f"💾 Salvar {title.split(':')[1].strip()} ({num} dezenas)", key=f'salvar_est_{key_suffix}'):
-                    st.session_state['jogos_salvos'].append(f"{title.split(':')[1].strip()} ({num}D) - {jogo_str}")
+                    repositorio_jogos.salvar(dono_jogos, title.split(':')[1].strip(), jogo, concurso_max)
                     st.success(f"Jogo salvo em 'Meus Jogos PRO': {jogo_str}")
 
             display_strategy_game("⭐ Estratégia 1: Otimizada (Score)", gerar_jogo_otimizado, df_freq_e_atraso, num_dez, "otm")
@@ -704,12 +833,142 @@ if df_completo is not None and not df_completo.empty:
             display_strategy_game("❄️ Estratégia 3: Apenas Atrasadas", gerar_jogo_atrasadas, df_freq_e_atraso, num_dez, "atr")
             st.markdown("---")
             display_strategy_game("⚖️ Estratégia 4: Balanceada", gerar_jogo_balanceado, df_freq_e_atraso, num_dez, "bal")
+            st.markdown("---")
+                
+            st.subheader("🎡 Fechamento (Desdobramento Reduzido)")
+            if num_dez == 6:
+                st.info("Escolha 7 ou mais dezenas acima para desdobrar o pool de uma estratégia em jogos de 6 dezenas.")
+            else:
+                st.info("Transforma as dezenas da estratégia em jogos de 6 com garantia: se as dezenas sorteadas do pool forem as da condição, pelo menos um jogo acerta o prêmio garantido.")
+                estrategias_pool = {
+                    'Otimizada (Score)': gerar_jogo_otimizado,
+                    'Apenas Quentes': gerar_jogo_quentes,
+                    'Apenas Atrasadas': gerar_jogo_atrasadas,
+                    'Balanceada': gerar_jogo_balanceado,
+                }
+                col_fc1, col_fc2, col_fc3 = st.columns(3)
+                with col_fc1:
+                    estrategia_fc = st.selectbox("Pool da estratégia:", options=list(estrategias_pool), key='estrategia_fechamento')
+                with col_fc2:
+                    garantia_fc = st.selectbox("Garantia:", options=list(GARANTIAS), key='garantia_fechamento')
+                with col_fc3:
+                    tempo_fc = st.slider("Tempo máximo (s):", min_value=1, max_value=15, value=3, key='tempo_fechamento')
+                    
+                if st.button("🎡 Gerar Fechamento", key='gerar_fechamento'):
+                    pool_fc = estrategias_pool[estrategia_fc](df_freq_e_atraso, num_dez)
+                    t_fc, m_fc = GARANTIAS[garantia_fc]
+                    try:
+                        with st.spinner("Montando o fechamento..."), perfil.medir(f'fechamento({num_dez}, {t_fc} se {m_fc})'):
+                            jogos_fc = gerar_fechamento(pool_fc, t_fc, m_fc, tempo_limite=float(tempo_fc))
+                        st.session_state['fechamento_gerado'] = {
+                            'estrategia': f'Fechamento {t_fc} se {m_fc} ({estrategia_fc})',
+                            'pool': pool_fc,
+                            'jogos': jogos_fc,
+                            'minimo': limite_inferior_schonheim(len(pool_fc), 6, t_fc) if t_fc == m_fc else None,
+                            'cobertura': verificar_fechamento(jogos_fc, pool_fc, t_fc, m_fc),
+                        }
+                    except ValueError as e:
+                        st.error(f"Não foi possível gerar o fechamento: {e}")
+                        
+                if 'fechamento_gerado' in st.session_state:
+                    fechamento = st.session_state['fechamento_gerado']
+                    col_fm1, col_fm2, col_fm3 = st.columns(3)
+                    col_fm1.metric("Jogos", len(fechamento['jogos']))
+                    col_fm2.metric("Limite inferior (Schönheim)", fechamento['minimo'] if fechamento['minimo'] is not None else "—")
+                    col_fm3.metric("Cobertura", f"{fechamento['cobertura']:.1%}")
+                    st.caption(f"{fechamento['estrategia']} — pool: {', '.join(f'{d:02d}' for d in fechamento['pool'])}")
+                    st.code('\n'.join(' '.join(f'{d:02d}' for d in jogo) for jogo in fechamento['jogos']), language='text')
+                    if st.button(f"💾 Salvar os {len(fechamento['jogos'])} jogos do fechamento", key='salvar_fechamento'):
+                        repositorio_jogos.salvar_varios(dono_jogos, [(fechamento['estrategia'], jogo, concurso_max) for jogo in fechamento['jogos']])
+                        st.success(f"{len(fechamento['jogos'])} jogos salvos em 'Meus Jogos PRO'.")
+            st.markdown("---")
+                
+            st.subheader("🔭 Varredura Completa (50.063.860 combinações)")
+            st.info("Pontua todas as combinações de 6 dezenas com o Score de cada dezena (Freq x 1.5 + Atraso x 0.5) mais um peso para os pares que mais saíram juntos no período, e mantém só as melhores que passam nos filtros.")
+                
+            col_vr1, col_vr2, col_vr3 = st.columns(3)
+            with col_vr1:
+                soma_vr = st.slider("Soma das dezenas:", min_value=21, max_value=345, value=(150, 220), key='soma_varredura')
+                peso_pares_vr = st.number_input("Peso dos pares (coocorrência):", min_value=0.0, max_value=10.0, value=0.5, step=0.1, key='peso_pares_varredura')
+            with col_vr2:
+                pares_vr = st.slider("Quantidade de pares:", min_value=0, max_value=6, value=(2, 4), key='pares_varredura')
+                top_k_vr = st.number_input("Melhores combinações:", min_value=1, max_value=1000, value=TOP_K_PADRAO, step=10, key='top_k_varredura')
+            with col_vr3:
+                primos_vr = st.slider("Quantidade de primos:", min_value=0, max_value=6, value=(0, 3), key='primos_varredura')
+                gravar_scores_vr = st.checkbox(f"Gravar o score de todas as combinações ({ARQUIVO_SCORES}, 200 MB)", key='gravar_scores_varredura')
+                
+            if st.button("🔭 Rodar Varredura Completa", key='rodar_varredura'):
+                score_dezena = df_freq_e_atraso['Vezes'].to_numpy() * 1.5 + df_freq_e_atraso['Atraso'].to_numpy() * 0.5
+                caminho_scores = None
+                if gravar_scores_vr:
+                    caminho_scores = os.path.join(diretorio_cache_padrao(FILE_PATH), ARQUIVO_SCORES)
+                    os.makedirs(os.path.dirname(caminho_scores), exist_ok=True)
+                with st.spinner("Pontuando todas as combinações em todos os núcleos..."):
+                    st.session_state['resultado_varredura'] = analise_em_cache(
+                        'varredura',
+                        lambda: varrer_combinacoes(
+                            score_dezena,
+                            matriz_pares(indice_pares.contagens(pos_inicio, pos_fim)),
+                            peso_pares=peso_pares_vr,
+                            soma=soma_vr,
+                            pares=pares_vr,
+                            primos=primos_vr,
+                            top_k=int(top_k_vr),
+                            caminho=caminho_scores
+                        ),
+                        soma_vr, pares_vr, primos_vr, peso_pares_vr, int(top_k_vr), caminho_scores
+                    )
+                    
+            if 'resultado_varredura' in st.session_state:
+                df_vr = st.session_state['resultado_varredura']
+                if df_vr.empty:
+                    st.warning("Nenhuma combinação passou nos filtros.")
+                else:
+                    st.dataframe(df_vr, use_container_width=True, hide_index=True)
+                    qtd_salvar_vr = st.number_input("Salvar as N melhores:", min_value=1, max_value=len(df_vr), value=min(10, len(df_vr)), key='qtd_salvar_varredura')
+                    if st.button("💾 Salvar as melhores da varredura", key='salvar_varredura'):
+                        repositorio_jogos.salvar_varios(dono_jogos, [
+                            ('Varredura Completa', [int(d) for d in jogo.split()], concurso_max)
+                            for jogo in df_vr['Jogo'].head(int(qtd_salvar_vr))
+                        ])
+                        st.success(f"{int(qtd_salvar_vr)} jogos salvos em 'Meus Jogos PRO'.")
+            st.markdown("---")
+                
+            st.subheader("🧪 Backtest das Estratégias")
+            st.info("Joga cada estratégia em todos os concursos do histórico, usando só os dados anteriores a cada sorteio, e compara com o acaso.")
+                
+            col_bt1, col_bt2 = st.columns(2)
+            with col_bt1:
+                janela_bt = st.number_input("Janela (concursos anteriores):", min_value=1, max_value=max(1, len(df_completo) - 1), value=min(100, max(1, len(df_completo) - 1)), step=10, key='janela_backtest')
+            with col_bt2:
+                tamanhos_bt = st.multiselect("Quantidades de dezenas:", options=list(TAMANHOS_PADRAO), default=list(TAMANHOS_PADRAO), key='tamanhos_backtest')
+                
+            if st.button("🧪 Rodar Backtest", key='rodar_backtest') and tamanhos_bt:
+                with st.spinner("Rodando o backtest em todo o histórico..."):
+                    st.session_state['resultado_backtest'] = executar_backtest(
+                        historico.concursos,
+                        historico.dezenas,
+                        janela=int(janela_bt),
+                        tamanhos=sorted(tamanhos_bt)
+                    )
+                
+            if 'resultado_backtest' in st.session_state:
+                df_bt = st.session_state['resultado_backtest']
+                fig_bt = px.line(df_bt, x='Dezenas', y='Quadra+ (%)', color='Estratégia', markers=True, title='Jogos com Quadra ou Mais (%)')
+                df_acaso = df_bt.drop_duplicates('Dezenas')
+                fig_bt.add_scatter(x=df_acaso['Dezenas'], y=df_acaso['Quadra+ Esperada (%)'], name='Acaso (teórico)', mode='lines', line=dict(dash='dash', color='gray'))
+                st.plotly_chart(fig_bt, use_container_width=True)
+                st.dataframe(df_bt, use_container_width=True, hide_index=True)
+
+        with tab_estrategias:
+            renderizar_aba_estrategias()
         
     # =================================================================
     # [CONDICIONAL] TAB: GERADORES
     # =================================================================
     if tab_geradores is not None:
-        with tab_geradores:
+        @fragmento_com_perfil('Geradores')
+        def renderizar_aba_geradores():
             st.header("🚀 Geradores de Jogos (Acesso PRO)")
             
             st.subheader("🔥 Gerador com Dezenas Muito Quentes")
@@ -752,11 +1011,15 @@ if df_completo is not None and not df_completo.empty:
                                 df_restantes = df_freq_e_atraso[~df_freq_e_atraso['Dezena'].isin(jogo_mq)].sort_values(by='Vezes', ascending=False)
                                 jogo_mq.extend([int(d) for d in df_restantes.head(faltam)['Dezena'].tolist()])
                                 
-                        jogo_mq = sorted(jogo_mq) # <--- Onde seu código parou!
+                        # Guarda o jogo na sessão para o botão Salvar sobreviver ao rerun do fragmento
+                        st.session_state['jogo_gerado_mq'] = sorted(jogo_mq)
+                        
+                    if 'jogo_gerado_mq' in st.session_state:
+                        jogo_mq = st.session_state['jogo_gerado_mq']
                         jogo_str = ' '.join([f'{d:02d}' for d in jogo_mq])
                         st.success(f"Jogo Gerado: {jogo_str}")
                         if st.button("💾 Salvar este Jogo (MQ)", key='salvar_mq'):
-                             st.session_state['jogos_salvos'].append(f"Gerador MQ ({num_gerar}D) - {jogo_str}")
+                             repositorio_jogos.salvar(dono_jogos, "Gerador MQ", jogo_mq, concurso_max)
                              st.success(f"Jogo salvo em 'Meus Jogos PRO': {jogo_str}")
                         st.markdown("---")
             else:
@@ -769,57 +1032,138 @@ if df_completo is not None and not df_completo.empty:
             num_dez_int = st.selectbox("Qtd de Dezenas:", options=[6, 7, 8, 9, 10], index=0, key='num_dez_int_select')
             
             if st.button("🔄 Gerar Jogo Aleatório Inteligente", key='gerar_int_btn'):
-                jogo_int = gerar_jogo_aleatorio_inteligente(df_freq_e_atraso, num_dez_int)
-                separador = ' ' if num_dez_int == 6 else ', '
+                st.session_state['jogo_gerado_int'] = gerar_jogo_aleatorio_inteligente(df_freq_e_atraso, num_dez_int)
+                
+            if 'jogo_gerado_int' in st.session_state:
+                jogo_int = st.session_state['jogo_gerado_int']
+                separador = ' ' if len(jogo_int) == 6 else ', '
                 jogo_str = separador.join([f'{d:02d}' for d in jogo_int])
                 st.success(f"Jogo Gerado: {jogo_str}")
                 if st.button("💾 Salvar este Jogo (AI)", key='salvar_int'):
-                    st.session_state['jogos_salvos'].append(f"Gerador AI ({num_dez_int}D) - {jogo_str}")
+                    repositorio_jogos.salvar(dono_jogos, "Gerador AI", jogo_int, concurso_max)
                     st.success(f"Jogo salvo em 'Meus Jogos PRO': {jogo_str}")
                 st.markdown("---")
 
+        with tab_geradores:
+            renderizar_aba_geradores()
+
     # =================================================================
     # [CONDICIONAL] TAB: MEUS JOGOS PRO
     # =================================================================
     if tab_meus_jogos is not None:
-        with tab_meus_jogos:
+        @fragmento_com_perfil('Meus Jogos PRO')
+        def renderizar_aba_meus_jogos():
             st.header("💾 Meus Jogos Salvos (Acesso PRO)")
             
-            if not st.session_state['jogos_salvos']:
+            # Cada aba é um fragmento: jogos salvos em outras abas aparecem ao atualizar só esta aba
+            st.button("🔄 Atualizar Lista", key='atualizar_jogos')
+            
+            if repositorio_jogos.contar(dono_jogos) == 0:
                 st.info("Nenhum jogo foi salvo ainda. Use as abas Estratégias e Geradores para criar e salvar seus jogos.")
             else:
                 st.markdown("---")
-                st.subheader("Lista de Jogos Salvos:")
                 
-                # Exibir jogos
-                for i, jogo in enumerate(st.session_state['jogos_salvos']):
-                    col_j1, col_j2 = st.columns([4, 1])
+                col_f1, col_f2 = st.columns(2)
+                with col_f1:
+                    filtro_estrategia = st.selectbox("Estratégia:", options=["Todas"] + repositorio_jogos.estrategias(dono_jogos), key='filtro_estrategia_jogos')
+                with col_f2:
+                    filtro_dezena = st.number_input("Contém a dezena (0 = qualquer):", min_value=0, max_value=60, value=0, step=1, key='filtro_dezena_jogos')
+                
+                estrategia_filtro = None if filtro_estrategia == "Todas" else filtro_estrategia
+                dezena_filtro = int(filtro_dezena) or None
+                total_filtrado = repositorio_jogos.contar(dono_jogos, estrategia_filtro, dezena_filtro)
+                
+                if total_filtrado == 0:
+                    st.info("Nenhum jogo salvo corresponde ao filtro.")
+                else:
+                    total_paginas = -(-total_filtrado // JOGOS_POR_PAGINA)
+                    if st.session_state.get('pagina_jogos', 1) > total_paginas:
+                        st.session_state['pagina_jogos'] = total_paginas
+                    pagina = st.number_input(f"Página (de {total_paginas}):", min_value=1, max_value=total_paginas, value=1, step=1, key='pagina_jogos')
+                    
+                    st.subheader(f"Lista de Jogos Salvos ({total_filtrado}):")
+                    
+                    # Exibir só a página atual: o custo não cresce com o total de jogos salvos
+                    jogos_pagina = repositorio_jogos.listar(dono_jogos, estrategia_filtro, dezena_filtro, JOGOS_POR_PAGINA, (pagina - 1) * JOGOS_POR_PAGINA)
+                    for jogo_salvo in jogos_pagina:
+                        col_j1, col_j2 = st.columns([4, 1])
+                        separador = ' ' if jogo_salvo['num_dezenas'] == 6 else ', '
+                        jogo = f"{jogo_salvo['estrategia']} ({jogo_salvo['num_dezenas']}D) - {separador.join(f'{d:02d}' for d in jogo_salvo['dezenas'])}"
+                        
+                        with col_j1:
+                             # Estilo para exibir o jogo
+                            st.markdown(f"""
+                            <div style="
+                                background: #e6e6e6; 
+                                border-radius: 5px; 
+                                padding: 10px; 
+                                margin: 5px 0; 
+                                font-family: monospace;
+                                color: black;
+                            ">
+                                {jogo}
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                        with col_j2:
+                            # Botão para remover
+                            if st.button("Remover", key=f'remover_jogo_{jogo_salvo["id"]}'):
+                                repositorio_jogos.remover(dono_jogos, [jogo_salvo['id']])
+                                st.rerun(scope="fragment")
+                    
+                    st.markdown("---")
+                    st.subheader("📈 Desempenho no Histórico")
+                    st.caption(f"Jogos desta página conferidos contra todos os {len(df_completo)} concursos (#{concurso_min} a #{concurso_max}).")
+                    
+                    # A conferência do filtro inteiro só roda pelo botão e fica em cache até os jogos mudarem
+                    # (versão do repositório) ou o filtro mudar; trocar de página ou remover um jogo não a refaz
+                    chave_conferencia = (repositorio_jogos.versao, dono_jogos, estrategia_filtro, dezena_filtro)
+                    if st.button(f"Conferir todos os {total_filtrado} jogos do filtro", key='conferir_jogos_filtro'):
+                        st.session_state['conferencia_jogos'] = chave_conferencia
                     
-                    with col_j1:
-                         # Estilo para exibir o jogo
-                        st.markdown(f"""
-                        <div style="
-                            background: #e6e6e6; 
-                            border-radius: 5px; 
-                            padding: 10px; 
-                            margin: 5px 0; 
-                            font-family: monospace;
-                            color: black;
-                        ">
-                            {jogo}
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                    with col_j2:
-                        # Botão para remover
-                        if st.button("Remover", key=f'remover_jogo_{i}'):
-                            del st.session_state['jogos_salvos'][i]
-                            st.success("Jogo removido.")
-                            time.sleep(0.1) # Pequena pausa para a UI atualizar
-                            st.rerun()
+                    if st.session_state.get('conferencia_jogos') == chave_conferencia:
+                        def conferir_filtro():
+                            _, estrategias_jogos, mascaras_jogos_salvos = repositorio_jogos.mascaras(dono_jogos, estrategia_filtro, dezena_filtro)
+                            return montar_conferencia(estrategias_jogos, mascaras_jogos_salvos, indice_ocorrencias.mascaras, historico.concursos)
+                        
+                        with st.spinner("Conferindo os jogos do filtro..."):
+                            df_conferencia_filtro = analise_em_cache(
+                                'conferencia_jogos', conferir_filtro, *chave_conferencia, janela=(concurso_min, concurso_max)
+                            )
+                        col_c1, col_c2, col_c3 = st.columns(3)
+                        col_c1.metric("Quadras (filtro)", int(df_conferencia_filtro['Quadras'].sum()))
+                        col_c2.metric("Quinas (filtro)", int(df_conferencia_filtro['Quinas'].sum()))
+                        col_c3.metric("Senas (filtro)", int(df_conferencia_filtro['Senas'].sum()))
+                        # Mesma ordem da lista (id decrescente): a página é um recorte do resultado em cache
+                        df_conferencia = df_conferencia_filtro.iloc[(pagina - 1) * JOGOS_POR_PAGINA:pagina * JOGOS_POR_PAGINA]
+                    else:
+                        df_conferencia = montar_conferencia(
+                            [jogo_salvo['estrategia'] for jogo_salvo in jogos_pagina],
+                            [jogo_salvo['mascara'] for jogo_salvo in jogos_pagina],
+                            indice_ocorrencias.mascaras,
+                            historico.concursos
+                        )
+                    st.dataframe(df_conferencia, use_container_width=True, hide_index=True)
                 
                 st.markdown("---")
-                if st.button("🗑️ Limpar Todos os Jogos Salvos", key='limpar_todos'):
-                    st.session_state['jogos_salvos'] = []
-                    st.success("Todos os jogos foram removidos.")
-                    st.rerun()
+                col_l1, col_l2 = st.columns(2)
+                with col_l1:
+                    if (estrategia_filtro or dezena_filtro) and total_filtrado > 0:
+                        if st.button(f"🗑️ Remover os {total_filtrado} Jogos Filtrados", key='limpar_filtrados'):
+                            repositorio_jogos.limpar(dono_jogos, estrategia_filtro, dezena_filtro)
+                            st.success("Jogos filtrados removidos.")
+                            st.rerun(scope="fragment")
+                with col_l2:
+                    if st.button("🗑️ Limpar Todos os Jogos Salvos", key='limpar_todos'):
+                        repositorio_jogos.limpar(dono_jogos)
+                        st.success("Todos os jogos foram removidos.")
+                        st.rerun(scope="fragment")
+
+        with tab_meus_jogos:
+            renderizar_aba_meus_jogos()
+
+    if perfil.ativo:
+        with painel_perfil.container():
+            st.caption(f"Execução completa: {perfil.total() * 1000:.0f} ms")
+            st.dataframe(perfil.tabela(), use_container_width=True, hide_index=True)
+        exportar_perfil(perfil, 'script')
@@ -0,0 +1,192 @@
+"""Benchmarks das análises com históricos sintéticos de 10 mil a 1 milhão de concursos.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/bench_mega.py                              # 10k, 100k e 1M concursos
+    python benchmarks/bench_mega.py --tamanhos 10000 100000 --salvar benchmarks/baseline.json
+    python benchmarks/bench_mega.py --comparar benchmarks/baseline.json --tolerancia 0.25
+
+Cada caso registra o tempo de parede (melhor de N repetições) e o pico de memória
+alocada (tracemalloc, que também enxerga os buffers do NumPy). Com --comparar, o
+script sai com código 1 se algum caso ficar mais lento que a base além da tolerância
+e de --minimo-ms (diferenças de poucos milissegundos são ruído de medição).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mega_dados import COLUNAS_DEZENAS, NUM_DEZENAS_SORTEADAS, NUM_DEZENAS_TOTAL, carregar_tabela  # noqa: E402
+from mega_estatisticas import (  # noqa: E402
+    analisar_padroes_avancados, analisar_sequencias_dezenas, calcular_frequencia_pares,
+    calcular_frequencia_trios, get_frequencia_e_atraso, tabela_pares, tabela_trios,
+)
+from mega_estrategias import (  # noqa: E402
+    gerar_jogo_aleatorio_inteligente, gerar_jogo_atrasadas, gerar_jogo_balanceado,
+    gerar_jogo_otimizado, gerar_jogo_quentes,
+)
+from mega_historico import HistoricoMega  # noqa: E402
+
+TAMANHOS_PADRAO = (10_000, 100_000, 1_000_000)
+JANELA_PADRAO = 100
+FORMATO_BASE = 1
+DIAS_CICLO_DATAS = 50_000
+
+
+def gerar_historico(num_concursos, semente=2025):
+    """Histórico sintético: cada concurso sorteia 6 dezenas distintas de 1 a 60."""
+    rng = np.random.default_rng(semente)
+    # As 6 menores chaves aleatórias de cada linha formam uma amostra sem reposição
+    dezenas = np.argpartition(rng.random((num_concursos, NUM_DEZENAS_TOTAL)), NUM_DEZENAS_SORTEADAS, axis=1)
+    dezenas = np.sort(dezenas[:, :NUM_DEZENAS_SORTEADAS] + 1, axis=1)
+    # Datas diárias que recomeçam a cada DIAS_CICLO_DATAS: 1M concursos semanais passariam do ano 9999
+    datas = np.datetime64('1996-03-11') + np.arange(num_concursos) % DIAS_CICLO_DATAS
+    df = pd.DataFrame(dezenas, columns=COLUNAS_DEZENAS)
+    df.insert(0, 'Data', pd.to_datetime(datas).strftime('%d/%m/%Y'))
+    df.insert(0, 'Concurso', np.arange(1, num_concursos + 1))
+    return df
+
+
+def medir(funcao, repeticoes):
+    """(melhor tempo em segundos, pico de memória em bytes) de `funcao()`."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return melhor, pico
+
+
+def casos(df, historico, dir_trabalho, caminho_csv, janela):
+    """Casos medidos: (nome, função sem argumentos)."""
+    df_janela = df.iloc[-janela:]
+    a, b = len(df) - janela, len(df)
+    freq_e_atraso = get_frequencia_e_atraso(df_janela, df)
+    dir_cache = os.path.join(dir_trabalho, 'cache')
+
+    def carga_fria():
+        shutil.rmtree(dir_cache, ignore_errors=True)
+        carregar_tabela(caminho_csv, dir_cache)
+
+    yield 'carregar_tabela (fria, CSV)', carga_fria
+    yield 'carregar_tabela (cache)', lambda: carregar_tabela(caminho_csv, dir_cache)
+    yield 'HistoricoMega (índices)', lambda: HistoricoMega(df)
+    yield 'get_frequencia_e_atraso (janela)', lambda: get_frequencia_e_atraso(df_janela, df)
+    yield 'get_frequencia_e_atraso (completo)', lambda: get_frequencia_e_atraso(df, df)
+    yield 'calcular_frequencia_pares (completo)', lambda: calcular_frequencia_pares(df, top_n=50)
+    yield 'calcular_frequencia_trios (completo)', lambda: calcular_frequencia_trios(df, top_n=15)
+    yield 'analisar_padroes_avancados (completo)', lambda: analisar_padroes_avancados(df)
+    yield 'analisar_sequencias_dezenas (completo)', lambda: analisar_sequencias_dezenas(df, 10)
+    # Caminho usado pelo app: consultas aos índices já montados
+    yield 'índice: frequência e atraso (janela)', lambda: historico.indice_ocorrencias.frequencia_e_atraso(
+        historico.concursos[a], historico.concursos[b - 1])
+    yield 'índice: pares (completo)', lambda: tabela_pares(historico.indice_pares.contagens(0, b), 50)
+    yield 'índice: trios (completo)', lambda: tabela_trios(historico.indice_trios.contagens(0, b), 15)
+    yield 'índice: sequência (janela)', lambda: historico.indice_transicoes.janela(a, b).sequencia(10)
+    yield 'índice: série móvel (passo 10)', lambda: historico.indice_ocorrencias.serie_janelas(janela, 10)
+    yield 'índice: intervalos (tabela)', historico.indice_intervalos.tabela
+    # Ingestão incremental: o histórico sem os últimos concursos ganha os 10 finais de volta
+    historico_anterior = HistoricoMega(df.iloc[:-10])
+    yield 'HistoricoMega.acrescentado (10 concursos)', lambda: historico_anterior.acrescentado(df.iloc[-10:])
+    for gerar in (gerar_jogo_otimizado, gerar_jogo_quentes, gerar_jogo_atrasadas,
+                  gerar_jogo_balanceado, gerar_jogo_aleatorio_inteligente):
+        yield gerar.__name__, lambda gerar=gerar: gerar(freq_e_atraso, 6)
+
+
+def executar(tamanhos, repeticoes, janela, semente):
+    resultados = {}
+    for num_concursos in tamanhos:
+        with tempfile.TemporaryDirectory() as dir_trabalho:
+            caminho_csv = os.path.join(dir_trabalho, f'mega_{num_concursos}.csv')
+            gerar_historico(num_concursos, semente).to_csv(caminho_csv, index=False)
+            df = carregar_tabela(caminho_csv, os.path.join(dir_trabalho, 'cache'))
+            historico = HistoricoMega(df)
+            por_caso = {}
+            for nome, funcao in casos(df, historico, dir_trabalho, caminho_csv, janela):
+                segundos, pico = medir(funcao, repeticoes)
+                por_caso[nome] = {'segundos': segundos, 'pico_bytes': pico}
+                print(f'{num_concursos:>9} | {nome:<42} | {segundos * 1000:10.2f} ms | {pico / 2**20:9.1f} MB', flush=True)
+            resultados[str(num_concursos)] = por_caso
+    return {
+        'formato': FORMATO_BASE,
+        'gerado_em': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parametros': {'repeticoes': repeticoes, 'janela': janela, 'semente': semente},
+        'resultados': resultados,
+    }
+
+
+def comparar(atual, base, tolerancia, minimo_segundos=0.0):
+    """Imprime a razão atual/base de cada caso e devolve quantos pioraram além da tolerância."""
+    regressoes = 0
+    for tamanho, por_caso in atual['resultados'].items():
+        for nome, medida in por_caso.items():
+            referencia = base.get('resultados', {}).get(tamanho, {}).get(nome)
+            if referencia is None:
+                # Caso novo (ou tamanho fora da base): sem comparação até regenerar a base
+                print(f'{tamanho:>9} | {nome:<42} | sem base')
+                continue
+            razao_tempo = medida['segundos'] / max(referencia['segundos'], 1e-9)
+            razao_memoria = medida['pico_bytes'] / max(referencia['pico_bytes'], 1)
+            piorou = razao_tempo > 1 + tolerancia and medida['segundos'] - referencia['segundos'] > minimo_segundos
+            regressoes += piorou
+            marca = 'REGRESSÃO' if piorou else ''
+            print(f'{tamanho:>9} | {nome:<42} | tempo x{razao_tempo:5.2f} | memória x{razao_memoria:5.2f} {marca}')
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--janela', type=int, default=JANELA_PADRAO)
+    parser.add_argument('--semente', type=int, default=2025)
+    parser.add_argument('--salvar', help='grava os resultados (JSON) neste caminho')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior usado como base')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='piora de tempo aceita (0.25 = 25%%)')
+    parser.add_argument('--minimo-ms', type=float, default=5.0, help='piora absoluta mínima para contar como regressão')
+    args = parser.parse_args(argv)
+
+    atual = executar(args.tamanhos, args.repeticoes, args.janela, args.semente)
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        print()
+        regressoes = comparar(atual, base, args.tolerancia, args.minimo_ms / 1000)
+        if regressoes:
+            print(f'{regressoes} caso(s) mais lento(s) que a base além de {args.tolerancia:.0%}.')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from mega_dados import NUM_DEZENAS_SORTEADAS, NUM_DEZENAS_TOTAL
+from mega_estatisticas import TAMANHO_VETOR, matriz_ocorrencias, ultimo_concurso_por_dezena
+from mega_estrategias import ESTRATEGIAS
+from mega_processos import mapear_em_processos
+
+TAMANHOS_PADRAO = (6, 7, 8, 9, 10, 12, 15)
+CONCURSOS_POR_TAREFA = 256
+FAIXAS = {3: 'Ternos', 4: 'Quadras', 5: 'Quinas', 6: 'Senas'}
+
+
+def _backtest_trecho(concursos, dezenas, pos_inicio, pos_fim, janela, tamanhos, nomes, semente):
+    """Joga cada estratégia em cada concurso de [pos_inicio, pos_fim) com as estatísticas até o anterior.
+
+    Devolve o histograma de acertos (estratégia, tamanho, 0..6). Frequência e atraso
+    são mantidos incrementalmente: a frequência da janela deslizante sai de um
+    acumulado local e o último concurso de cada dezena é atualizado a cada passo.
+    """
+    rng = np.random.default_rng(semente)
+    base = max(0, pos_inicio - janela)
+    acumulado = np.zeros((pos_fim - base + 1, TAMANHO_VETOR), dtype=np.int64)
+    np.cumsum(matriz_ocorrencias(dezenas[base:pos_fim]), axis=0, out=acumulado[1:])
+    ultimo = ultimo_concurso_por_dezena(dezenas[:pos_inicio], concursos[:pos_inicio])
+
+    escolhas = [ESTRATEGIAS[nome] for nome in nomes]
+    acertos = np.zeros((len(nomes), len(tamanhos), NUM_DEZENAS_SORTEADAS + 1), dtype=np.int64)
+    for t in range(pos_inicio, pos_fim):
+        vezes = (acumulado[t - base] - acumulado[max(0, t - janela) - base])[1:]
+        atraso = np.where(ultimo[1:] >= 0, concursos[t - 1] - ultimo[1:], t)
+        sorteio = {int(d) for d in dezenas[t] if d > 0}
+        for e, escolher in enumerate(escolhas):
+            for k, num_dezenas in enumerate(tamanhos):
+                jogo = escolher(vezes, atraso, num_dezenas, rng)
+                acertos[e, k, len(sorteio.intersection(jogo))] += 1
+        # Concursos são crescentes, então a atribuição direta mantém o máximo
+        ultimo[dezenas[t]] = concursos[t]
+    return acertos
+
+
+def _executar_tarefa(args):
+    return _backtest_trecho(*args)
+
+
+def prob_acertos_acaso(num_dezenas, acertos):
+    """Probabilidade hipergeométrica de um jogo aleatório de num_dezenas acertar exatamente `acertos`."""
+    return (
+        comb(NUM_DEZENAS_SORTEADAS, acertos) * comb(NUM_DEZENAS_TOTAL - NUM_DEZENAS_SORTEADAS, num_dezenas - acertos)
+        / comb(NUM_DEZENAS_TOTAL, num_dezenas)
+    )
+
+
+def relatorio_backtest(acertos, nomes, tamanhos):
+    linhas = []
+    faixas = np.arange(NUM_DEZENAS_SORTEADAS + 1)
+    for e, nome in enumerate(nomes):
+        for k, num_dezenas in enumerate(tamanhos):
+            hist = acertos[e, k]
+            jogos = int(hist.sum())
+            linha = {
+                'Estratégia': nome,
+                'Dezenas': num_dezenas,
+                'Jogos': jogos,
+                'Acertos Médios': float((hist * faixas).sum() / jogos) if jogos else 0.0,
+                'Esperado (Acaso)': num_dezenas * NUM_DEZENAS_SORTEADAS / NUM_DEZENAS_TOTAL,
+            }
+            for minimo, nome_faixa in FAIXAS.items():
+                linha[nome_faixa] = int(hist[minimo])
+            quadra_ou_mais = int(hist[4:].sum())
+            linha['Quadra+ (%)'] = 100 * quadra_ou_mais / jogos if jogos else 0.0
+            linha['Quadra+ Esperada (%)'] = 100 * sum(prob_acertos_acaso(num_dezenas, a) for a in range(4, NUM_DEZENAS_SORTEADAS + 1))
+            linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def executar_backtest(concursos, dezenas, janela=100, tamanhos=TAMANHOS_PADRAO, estrategias=None,
+                      pos_inicio=None, processos=None, semente=2025):
+    """Backtest de todas as estratégias em todo o histórico, dividido em trechos entre processos.
+
+    Cada concurso t é jogado com a frequência dos `janela` concursos anteriores e o atraso
+    até t-1. Os trechos têm tamanho fixo e semente própria, então o resultado não depende
+    do número de processos.
+    """
+    concursos = np.asarray(concursos, dtype=np.int64)
+    dezenas = np.asarray(dezenas)
+    nomes = list(estrategias or ESTRATEGIAS)
+    tamanhos = list(tamanhos)
+    pos_inicio = max(1, janela if pos_inicio is None else pos_inicio)
+
+    limites = list(range(pos_inicio, len(concursos), CONCURSOS_POR_TAREFA)) + [len(concursos)]
+    trechos = list(zip(limites[:-1], limites[1:]))
+    sementes = np.random.SeedSequence(semente).spawn(len(trechos))
+    tarefas = [
+        (concursos, dezenas, a, b, janela, tamanhos, nomes, s)
+        for (a, b), s in zip(trechos, sementes)
+    ]
+
+    acertos = np.zeros((len(nomes), len(tamanhos), NUM_DEZENAS_SORTEADAS + 1), dtype=np.int64)
+    resultados = mapear_em_processos(_executar_tarefa, tarefas, processos)
+    for parcial in resultados:
+        acertos += parcial
+    return relatorio_backtest(acertos, nomes, tamanhos)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from mega_dados import NUM_DEZENAS_TOTAL
+
+# Cada concurso ou jogo vira um inteiro de 64 bits: a dezena d liga o bit d - 1.
+# Conferir um jogo contra o histórico inteiro é um AND seguido de popcount.
+BIT_DEZENA = np.zeros(NUM_DEZENAS_TOTAL + 1, dtype=np.uint64)
+BIT_DEZENA[1:] = np.left_shift(np.uint64(1), np.arange(NUM_DEZENAS_TOTAL, dtype=np.uint64))
+
+_BITS_POR_BYTE = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+
+
+def popcount(valores):
+    """Quantidade de bits ligados em cada elemento de um array uint64."""
+    valores = np.asarray(valores, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(valores)
+    # NumPy < 2.0: soma a contagem de cada um dos 8 bytes
+    return _BITS_POR_BYTE[valores[..., None].view(np.uint8)].sum(axis=-1, dtype=np.uint8)
+
+
+def mascaras_concursos(dezenas):
+    """Máscara de 64 bits de cada linha de uma matriz (n, k) de dezenas; zeros são ignorados."""
+    dezenas = np.asarray(dezenas)
+    dezenas = np.where((dezenas > 0) & (dezenas <= NUM_DEZENAS_TOTAL), dezenas, 0)
+    return np.bitwise_or.reduce(BIT_DEZENA[dezenas], axis=1)
+
+
+def mascara_jogo(dezenas):
+    return np.bitwise_or.reduce(BIT_DEZENA[np.asarray(list(dezenas), dtype=np.int64)], initial=np.uint64(0))
+
+
+def dezenas_da_mascara(mascara):
+    mascara = int(mascara)
+    return [d for d in range(1, NUM_DEZENAS_TOTAL + 1) if mascara >> (d - 1) & 1]
+
+
+def matriz_acertos(mascaras_de_jogos, mascaras):
+    """Acertos de cada jogo contra cada concurso: matriz (n_jogos, n_concursos) uint8."""
+    return popcount(np.bitwise_and(np.asarray(mascaras_de_jogos, dtype=np.uint64)[:, None], mascaras[None, :]))
@@ -0,0 +1,129 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Resultados de análises compartilhados por todas as sessões do processo.
+# A chave é (versão dos dados, concurso_inicio, concurso_fim, função, parâmetros):
+# com muitos usuários na janela padrão, cada resultado é calculado uma vez só.
+# Os valores guardados são compartilhados, então quem for alterá-los faz .copy() antes.
+LIMITE_BYTES_PADRAO = 64 << 20
+LIMITE_ITENS_PADRAO = 512
+
+
+def tamanho_estimado(valor):
+    """Bytes aproximados ocupados por um resultado (DataFrame, array, dict/list desses ou escalar)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_estimado(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_estimado(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def versao_dados(concursos, dezenas):
+    """Identificador do conteúdo do histórico: muda sempre que os dados carregados mudam."""
+    h = hashlib.sha1()
+    for arr in (concursos, dezenas):
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.dtype).encode())
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()[:16]
+
+
+def versao_acrescentada(versao, concursos_novos, dezenas_novas):
+    """Versão de um histórico que só ganhou linhas no fim: encadeia a anterior com os dados novos.
+
+    Não relê o histórico inteiro; por isso difere da versao_dados() do mesmo conteúdo,
+    o que só custa recalcular as análises uma vez depois de reiniciar o processo.
+    """
+    h = hashlib.sha1(versao.encode())
+    for arr in (concursos_novos, dezenas_novas):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:16]
+
+
+class CacheResultados:
+    """Cache LRU limitado por bytes e por quantidade de itens, seguro entre threads."""
+
+    def __init__(self, limite_bytes=LIMITE_BYTES_PADRAO, limite_itens=LIMITE_ITENS_PADRAO):
+        self.limite_bytes = limite_bytes
+        self.limite_itens = limite_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def obter(self, chave, calcular):
+        """Devolve o resultado da chave, calculando (fora do lock) e guardando se ainda não existir."""
+        return self.obter_com_status(chave, calcular)[0]
+
+    def obter_com_status(self, chave, calcular):
+        """Como obter(), mas devolve (valor, acertou) para quem mede acertos por consulta."""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0], True
+            self.falhas += 1
+        # Duas sessões podem calcular a mesma chave ao mesmo tempo; o resultado é o mesmo.
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor, False
+
+    def guardar(self, chave, valor):
+        tamanho = tamanho_estimado(valor)
+        if tamanho > self.limite_bytes:
+            return
+        with self._lock:
+            if chave in self._itens:
+                self.bytes -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.limite_bytes or len(self._itens) > self.limite_itens:
+                _, (_, tamanho_antigo) = self._itens.popitem(last=False)
+                self.bytes -= tamanho_antigo
+                self.despejos += 1
+
+    def invalidar(self, manter_versao=None):
+        """Descarta tudo, ou só as entradas de versões dos dados diferentes de manter_versao."""
+        with self._lock:
+            if manter_versao is None:
+                self._itens.clear()
+            else:
+                for chave in [c for c in self._itens if c[0] != manter_versao]:
+                    del self._itens[chave]
+            self.bytes = sum(tamanho for _, tamanho in self._itens.values())
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                'itens': len(self._itens),
+                'bytes': self.bytes,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'despejos': self.despejos,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._itens)
+
+
+CACHE_ANALISES = CacheResultados()
+
+
+def chave_analise(versao, concurso_inicio, concurso_fim, nome, *parametros):
+    return (versao, int(concurso_inicio), int(concurso_fim), nome, parametros)
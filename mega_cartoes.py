@@ -0,0 +1,71 @@
+from html import escape
+
+# Grades de cartões montadas como um único bloco HTML: um st.markdown por grade em vez
+# de um por cartão (cada chamada é uma mensagem a mais no websocket e um elemento a mais
+# para o navegador posicionar). O estilo vai por classe, não repetido em cada cartão.
+ESTILO_CARTOES = """<style>
+.mega-grade {display: grid; gap: 10px; margin: 5px 0 15px 0;}
+.mega-cartao {padding: 10px; border-radius: 8px; color: white;}
+.mega-cartao.lista {display: flex; justify-content: space-between; align-items: center;}
+.mega-cartao.lista .textos {text-align: right;}
+.mega-cartao.centro {padding: 15px; border-radius: 10px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);}
+.mega-cartao .rotulo {font-size: 11px; opacity: 0.9;}
+.mega-cartao .titulo {font-weight: bold; margin: 4px 0;}
+.mega-cartao.centro .detalhe {font-size: 14px;}
+.mega-cartao .rodape {font-size: 12px; opacity: 0.85;}
+</style>"""
+
+GRADIENTES = {
+    'rosa': 'linear-gradient(135deg, #f093fb 0%, #f5576c 100%)',
+    'azul': 'linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)',
+    'roxo': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+    'vermelho': 'linear-gradient(135deg, #ff6b6b 0%, #ee5a6f 100%)',
+}
+
+_CARTAO = {
+    'lista': (
+        '<div class="mega-cartao lista" style="background: {fundo};">'
+        '<div class="titulo" style="font-size: {tamanho}px;">{titulo}</div>'
+        '<div class="textos"><div class="detalhe">{detalhe}</div><div class="rodape">{rodape}</div></div>'
+        '</div>'
+    ),
+    'centro': (
+        '<div class="mega-cartao centro" style="background: {fundo};">'
+        '<div class="rotulo">{rotulo}</div>'
+        '<div class="titulo" style="font-size: {tamanho}px;">{titulo}</div>'
+        '<div class="detalhe">{detalhe}</div><div class="rodape">{rodape}</div>'
+        '</div>'
+    ),
+}
+
+
+def _textos(valores, quantidade):
+    if valores is None:
+        return [''] * quantidade
+    return [escape(str(v)) for v in valores]
+
+
+def grade_cartoes(titulos, detalhes, rodapes=None, rotulos=None, gradiente='roxo', colunas=1,
+                  layout='lista', tamanho_titulo=24):
+    """HTML de uma grade inteira de cartões, para ser enviado em um único st.markdown.
+
+    `titulos`, `detalhes`, `rodapes` e `rotulos` são sequências (ou colunas de um
+    DataFrame já formatadas), uma posição por cartão. Sem rótulos, o layout 'centro'
+    numera os cartões (#1, #2, ...).
+    """
+    titulos = _textos(titulos, 0)
+    quantidade = len(titulos)
+    if rotulos is None and layout == 'centro':
+        rotulos = [f'#{i}' for i in range(1, quantidade + 1)]
+    modelo = _CARTAO[layout]
+    fundo = GRADIENTES.get(gradiente, gradiente)
+    cartoes = ''.join(
+        modelo.format(fundo=fundo, tamanho=tamanho_titulo, titulo=t, detalhe=d, rodape=r, rotulo=ro)
+        for t, d, r, ro in zip(
+            titulos, _textos(detalhes, quantidade), _textos(rodapes, quantidade), _textos(rotulos, quantidade)
+        )
+    )
+    return (
+        f'{ESTILO_CARTOES}<div class="mega-grade" style="grid-template-columns: repeat({colunas}, minmax(0, 1fr));">'
+        f'{cartoes}</div>'
+    )
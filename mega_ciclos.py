@@ -0,0 +1,76 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from mega_bitsets import dezenas_da_mascara
+from mega_dados import NUM_DEZENAS_TOTAL
+
+# Ciclo das dezenas: sequência de concursos, a partir do fim do ciclo anterior, até que
+# todas as 60 dezenas tenham saído pelo menos uma vez. Basta um OR das máscaras de 64 bits
+# (mega_bitsets) de cada concurso; o ciclo fecha quando a máscara acumulada fica cheia.
+MASCARA_COMPLETA = (1 << NUM_DEZENAS_TOTAL) - 1
+
+
+class IndiceCiclos:
+    """Ciclos fechados (início, fim, duração) e o ciclo aberto, mantidos incrementalmente."""
+
+    def __init__(self, concursos, mascaras):
+        self.inicios = []
+        self.fins = []
+        self.duracoes = []
+        self.inicio_aberto = None
+        self.mascara_aberta = 0
+        self.duracao_aberta = 0
+        # Uma passada com o mesmo passo de acrescentar(), em variáveis locais; tolist() troca
+        # os uint64 do NumPy por int do Python (OR e comparação bem mais baratos)
+        concursos = np.asarray(concursos).tolist()
+        acumulada, inicio = 0, 0
+        for i, mascara in enumerate(np.asarray(mascaras, dtype=np.uint64).tolist()):
+            acumulada |= mascara
+            if acumulada == MASCARA_COMPLETA:
+                self.inicios.append(concursos[inicio])
+                self.fins.append(concursos[i])
+                self.duracoes.append(i + 1 - inicio)
+                acumulada, inicio = 0, i + 1
+        if inicio < len(concursos):
+            self.inicio_aberto = concursos[inicio]
+            self.mascara_aberta = acumulada
+            self.duracao_aberta = len(concursos) - inicio
+
+    def acrescentar(self, concurso, mascara):
+        """Acrescenta um concurso (o mais recente) em O(1). Devolve True se ele fechou um ciclo."""
+        if self.inicio_aberto is None:
+            self.inicio_aberto = int(concurso)
+        self.mascara_aberta |= int(mascara)
+        self.duracao_aberta += 1
+        if self.mascara_aberta != MASCARA_COMPLETA:
+            return False
+        self.inicios.append(self.inicio_aberto)
+        self.fins.append(int(concurso))
+        self.duracoes.append(self.duracao_aberta)
+        self.inicio_aberto = None
+        self.mascara_aberta = 0
+        self.duracao_aberta = 0
+        return True
+
+    def acrescentado(self, concursos_novos, mascaras_novas):
+        """Cópia do índice com os concursos novos (o original continua valendo para quem o lê)."""
+        novo = copy.copy(self)
+        novo.inicios, novo.fins, novo.duracoes = list(self.inicios), list(self.fins), list(self.duracoes)
+        for concurso, mascara in zip(np.asarray(concursos_novos).tolist(), np.asarray(mascaras_novas, dtype=np.uint64).tolist()):
+            novo.acrescentar(concurso, mascara)
+        return novo
+
+    def faltantes(self):
+        """Dezenas que ainda não saíram no ciclo aberto (todas, se ele nem começou)."""
+        return dezenas_da_mascara(MASCARA_COMPLETA & ~self.mascara_aberta)
+
+    def tabela(self):
+        """Um ciclo fechado por linha, do mais antigo ao mais recente."""
+        return pd.DataFrame({
+            'Ciclo': np.arange(1, len(self.duracoes) + 1),
+            'Início': np.asarray(self.inicios, dtype=np.int64),
+            'Fim': np.asarray(self.fins, dtype=np.int64),
+            'Concursos': np.asarray(self.duracoes, dtype=np.int64),
+        })
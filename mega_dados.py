@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_DEZENAS = ['B1', 'B2', 'B3', 'B4', 'B5', 'B6']
+NUM_DEZENAS_TOTAL = 60
+NUM_DEZENAS_SORTEADAS = 6
+
+# Cache colunar: cada coluna vira um bloco binário cru (mapeável em memória)
+# e o meta.json guarda dtype/shape de cada bloco e a assinatura do arquivo de origem.
+VERSAO_FORMATO_CACHE = 3
+NOME_DIR_CACHE = ".cache_mega"
+ARQUIVO_META = "meta.json"
+# Concursos acrescentados sem mexer na planilha ficam num diário CSV ao lado dela
+# (MegaSena_novos.csv); a carga completa junta os dois.
+SUFIXO_NOVOS = "_novos.csv"
+COLUNAS_ENTRADA = ['Concurso', 'Data'] + COLUNAS_DEZENAS
+
+
+def normalizar_dezenas(dezenas):
+    """Matriz (n, 6) uint8 contígua, cada linha em ordem crescente com os zeros (faltantes) no fim.
+
+    Valores fora de 1..60 viram zero, então o uint8 nunca estoura.
+    """
+    dezenas = np.asarray(dezenas, dtype=np.int64)
+    dezenas = np.where((dezenas >= 1) & (dezenas <= NUM_DEZENAS_TOTAL), dezenas, 0)
+    # Ordena com os zeros trocados por um valor maior que qualquer dezena, para irem ao fim da linha
+    ordenadas = np.sort(np.where(dezenas > 0, dezenas, NUM_DEZENAS_TOTAL + 1), axis=1)
+    ordenadas[ordenadas > NUM_DEZENAS_TOTAL] = 0
+    return np.ascontiguousarray(ordenadas, dtype=np.uint8)
+
+
+def linhas_completas(dezenas):
+    """Linhas com as 6 dezenas válidas; calculado uma vez na carga para os laços não filtrarem zeros."""
+    return np.asarray(dezenas)[:, NUM_DEZENAS_SORTEADAS - 1] > 0
+
+
+def ler_planilha(file_path):
+    """Lê o Excel/CSV de origem e devolve a tabela normalizada (Concurso, Data, B1..B6, Completo)."""
+    if file_path.lower().endswith('.csv'):
+        df = pd.read_csv(file_path)
+    else:
+        df = pd.read_excel(file_path)
+
+    if len(df.columns) < 8:
+        raise ValueError("Estrutura do Excel incorreta. Esperado no mínimo 8 colunas (Concurso, Data, B1..B6).")
+
+    df = df.iloc[:, 0:8]
+    df.columns = COLUNAS_ENTRADA
+    return normalizar_tabela(df)
+
+
+def normalizar_tabela(df):
+    """Tabela normalizada a partir das colunas Concurso, Data, B1..B6 (planilha, diário ou entrada nova)."""
+    df = df.set_index('Concurso').sort_index()
+    dezenas = normalizar_dezenas(df[COLUNAS_DEZENAS].fillna(0).to_numpy())
+    # Datas no formato dd/mm/aaaa da Caixa (ou já como data no Excel); inválidas viram NaT
+    datas = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce').to_numpy().astype('datetime64[D]')
+    return _colunas_para_tabela({
+        'concursos': df.index.to_numpy(dtype=np.int64),
+        'datas': datas,
+        'dezenas': dezenas,
+        'completo': linhas_completas(dezenas),
+    })
+
+
+def ler_novos_concursos(arquivo, formato=None):
+    """Lê concursos novos de um CSV ou JSON, sem normalizar (a validação vem antes, em mega_ingestao).
+
+    `arquivo` é um caminho ou um arquivo aberto; o formato vem da extensão quando não é
+    informado. O CSV tem as colunas Concurso, Data, B1..B6. O JSON é uma lista de
+    registros (ou {"concursos": [...]}) com Concurso, Data (dd/mm/aaaa, como na planilha)
+    e B1..B6 ou uma lista "Dezenas".
+    """
+    if formato is None:
+        formato = os.path.splitext(arquivo)[1]
+    formato = formato.lower().lstrip('.')
+    if formato == 'csv':
+        df = pd.read_csv(arquivo)
+        if len(df.columns) < 8:
+            raise ValueError("Estrutura do CSV incorreta. Esperado no mínimo 8 colunas (Concurso, Data, B1..B6).")
+        df = df.iloc[:, 0:8]
+        df.columns = COLUNAS_ENTRADA
+        return df
+    if formato != 'json':
+        raise ValueError(f"Formato '{formato}' não suportado: use CSV ou JSON.")
+
+    if isinstance(arquivo, str):
+        with open(arquivo, encoding='utf-8') as f:
+            registros = json.load(f)
+    else:
+        registros = json.load(arquivo)
+    if isinstance(registros, dict):
+        registros = registros.get('concursos', [])
+    linhas = []
+    for registro in registros:
+        dezenas = registro.get('Dezenas')
+        if dezenas is None:
+            dezenas = [registro.get(coluna) for coluna in COLUNAS_DEZENAS]
+        if len(dezenas) != NUM_DEZENAS_SORTEADAS:
+            raise ValueError(f"Concurso {registro.get('Concurso')}: esperado {NUM_DEZENAS_SORTEADAS} dezenas.")
+        linhas.append([registro.get('Concurso'), registro.get('Data')] + list(dezenas))
+    return pd.DataFrame(linhas, columns=COLUNAS_ENTRADA)
+
+
+def arquivo_novos_concursos(file_path):
+    return os.path.splitext(file_path)[0] + SUFIXO_NOVOS
+
+
+def _assinatura_novos(file_path):
+    caminho = arquivo_novos_concursos(file_path)
+    return assinatura_arquivo(caminho) if os.path.exists(caminho) else None
+
+
+def _mesclar_novos(df, file_path):
+    """Junta à planilha os concursos do diário posteriores a ela (os já incluídos na planilha são ignorados)."""
+    caminho = arquivo_novos_concursos(file_path)
+    if not os.path.exists(caminho):
+        return df
+    novos = normalizar_tabela(ler_novos_concursos(caminho, 'csv'))
+    if not df.empty:
+        novos = novos[novos.index > df.index.max()]
+    if novos.empty:
+        return df
+    return _colunas_para_tabela({
+        nome: np.concatenate([antigo, novo])
+        for (nome, antigo), novo in zip(_tabela_para_colunas(df).items(), _tabela_para_colunas(novos).values())
+    })
+
+
+def diretorio_cache_padrao(file_path):
+    pasta, nome = os.path.split(os.path.abspath(file_path))
+    return os.path.join(pasta, NOME_DIR_CACHE, nome)
+
+
+def hash_arquivo(file_path, tamanho_bloco=1 << 20):
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def assinatura_arquivo(file_path):
+    st_arquivo = os.stat(file_path)
+    return {'mtime_ns': st_arquivo.st_mtime_ns, 'tamanho': st_arquivo.st_size}
+
+
+def _tabela_para_colunas(df):
+    return {
+        'concursos': df.index.to_numpy(dtype=np.int64),
+        'datas': df['Data'].to_numpy(dtype='datetime64[D]'),
+        'dezenas': np.ascontiguousarray(df[COLUNAS_DEZENAS].to_numpy(dtype=np.uint8)),
+        'completo': df['Completo'].to_numpy(dtype=bool),
+    }
+
+
+def _colunas_para_tabela(colunas):
+    df = pd.DataFrame(colunas['dezenas'], columns=COLUNAS_DEZENAS)
+    df.insert(0, 'Data', colunas['datas'])
+    df['Completo'] = colunas['completo']
+    df.index = pd.Index(colunas['concursos'], name='Concurso')
+    return df
+
+
+def _ler_meta(dir_cache):
+    try:
+        with open(os.path.join(dir_cache, ARQUIVO_META), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_meta(dir_cache, meta):
+    caminho = os.path.join(dir_cache, ARQUIVO_META)
+    tmp = f'{caminho}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, caminho)
+
+
+def gravar_cache(dir_cache, df, origem):
+    os.makedirs(dir_cache, exist_ok=True)
+    blocos = {}
+    for nome, arr in _tabela_para_colunas(df).items():
+        caminho = os.path.join(dir_cache, nome + '.bin')
+        tmp = f'{caminho}.{os.getpid()}.tmp'
+        arr.tofile(tmp)
+        os.replace(tmp, caminho)
+        blocos[nome] = {'dtype': arr.dtype.str, 'shape': list(arr.shape)}
+    # O meta.json é gravado por último: um cache interrompido no meio nunca parece válido.
+    _gravar_meta(dir_cache, {
+        'versao_formato': VERSAO_FORMATO_CACHE,
+        'origem': origem,
+        'blocos': blocos,
+    })
+
+
+def acrescentar_cache(dir_cache, df_novos, total_antes, assinatura_novos):
+    """Acrescenta as linhas novas ao fim de cada bloco .bin e atualiza o meta.json.
+
+    Só escreve as linhas novas. Devolve False (sem alterar nada) se o cache não tiver
+    exatamente `total_antes` linhas. `assinatura_novos` é a do diário já atualizado,
+    guardada na origem para a próxima carga reconhecer o cache. Os bytes vão
+    antes do meta: uma interrupção no meio deixa os blocos maiores que o meta declara
+    e ler_cache descarta o cache pelo tamanho.
+    """
+    meta = _ler_meta(dir_cache)
+    if meta is None or meta.get('versao_formato') != VERSAO_FORMATO_CACHE:
+        return False
+    colunas = _tabela_para_colunas(df_novos)
+    blocos = meta.get('blocos', {})
+    for nome, arr in colunas.items():
+        info = blocos.get(nome)
+        caminho = os.path.join(dir_cache, nome + '.bin')
+        if (info is None or info['shape'][0] != total_antes or np.dtype(info['dtype']) != arr.dtype
+                or not os.path.exists(caminho)
+                or os.path.getsize(caminho) != arr.dtype.itemsize * int(np.prod(info['shape']))):
+            return False
+    for nome, arr in colunas.items():
+        with open(os.path.join(dir_cache, nome + '.bin'), 'ab') as f:
+            arr.tofile(f)
+        blocos[nome]['shape'][0] += len(arr)
+    meta['origem']['novos'] = assinatura_novos
+    _gravar_meta(dir_cache, meta)
+    return True
+
+
+def ler_cache(dir_cache, meta):
+    colunas = {}
+    for nome, info in meta['blocos'].items():
+        caminho = os.path.join(dir_cache, nome + '.bin')
+        dtype = np.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+        if os.path.getsize(caminho) != dtype.itemsize * int(np.prod(shape)):
+            raise ValueError(f"Bloco '{nome}' do cache com tamanho inesperado.")
+        if shape[0] == 0:
+            colunas[nome] = np.empty(shape, dtype=dtype)
+        else:
+            colunas[nome] = np.memmap(caminho, dtype=dtype, mode='r', shape=shape)
+    return _colunas_para_tabela(colunas)
+
+
+def _origem_confere(meta, file_path, assinatura):
+    origem = meta.get('origem', {})
+    # O diário de concursos novos também faz parte da origem
+    if origem.get('novos') != _assinatura_novos(file_path):
+        return False
+    return _planilha_confere(origem, file_path, assinatura)
+
+
+def _planilha_confere(origem, file_path, assinatura):
+    if origem.get('tamanho') != assinatura['tamanho']:
+        return False
+    if origem.get('mtime_ns') == assinatura['mtime_ns']:
+        return True
+    # Mesmo tamanho mas mtime diferente (cópia, checkout do git...): decide pelo conteúdo.
+    return origem.get('sha256') == hash_arquivo(file_path)
+
+
+def _origem(file_path, assinatura):
+    return dict(assinatura, sha256=hash_arquivo(file_path), novos=_assinatura_novos(file_path))
+
+
+def registrar_novos_concursos(file_path, df_novos, total_antes, dir_cache=None):
+    """Grava concursos já validados no diário e no cache, sem reler a planilha.
+
+    O diário recebe só as linhas novas e o cache só os bytes delas (acrescentar_cache).
+    Se o cache não corresponder ao histórico anterior, ele é apenas descartado e a
+    próxima carga completa o refaz. Devolve False se não foi possível gravar (ex.: deploy
+    somente leitura); o histórico em memória continua valendo para o processo.
+    """
+    if dir_cache is None:
+        dir_cache = diretorio_cache_padrao(file_path)
+    caminho = arquivo_novos_concursos(file_path)
+    diario = pd.DataFrame({
+        'Concurso': df_novos.index.to_numpy(dtype=np.int64),
+        'Data': pd.to_datetime(df_novos['Data']).dt.strftime('%d/%m/%Y').to_numpy(),
+    })
+    for coluna in COLUNAS_DEZENAS:
+        diario[coluna] = df_novos[coluna].to_numpy(dtype=np.int64)
+    try:
+        diario.to_csv(caminho, mode='a', header=not os.path.exists(caminho), index=False)
+    except OSError:
+        return False
+
+    try:
+        meta = _ler_meta(dir_cache)
+        if (meta is not None and os.path.exists(file_path)
+                and _planilha_confere(meta.get('origem', {}), file_path, assinatura_arquivo(file_path))
+                and acrescentar_cache(dir_cache, df_novos, total_antes, _assinatura_novos(file_path))):
+            return True
+        # Cache de outra origem (ou ausente): descarta, a próxima carga completa regrava
+        if meta is not None:
+            os.remove(os.path.join(dir_cache, ARQUIVO_META))
+    except (OSError, KeyError):
+        pass
+    return True
+
+
+def carregar_tabela(file_path, dir_cache=None):
+    """Carrega a tabela normalizada usando o cache binário quando ele ainda corresponde à origem."""
+    if dir_cache is None:
+        dir_cache = diretorio_cache_padrao(file_path)
+
+    assinatura = assinatura_arquivo(file_path)
+    meta = _ler_meta(dir_cache)
+    if meta is not None and meta.get('versao_formato') == VERSAO_FORMATO_CACHE:
+        try:
+            if _origem_confere(meta, file_path, assinatura):
+                df = ler_cache(dir_cache, meta)
+                if meta['origem'].get('mtime_ns') != assinatura['mtime_ns']:
+                    meta['origem'].update(assinatura)
+                    _gravar_meta(dir_cache, meta)
+                return df
+        except (OSError, ValueError, KeyError):
+            pass
+
+    df = _mesclar_novos(ler_planilha(file_path), file_path)
+    try:
+        gravar_cache(dir_cache, df, _origem(file_path, assinatura))
+    except OSError:
+        # Sem permissão de escrita (ex.: deploy somente leitura): segue sem cache.
+        pass
+    return df
@@ -0,0 +1,630 @@
+import copy
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from mega_bitsets import mascaras_concursos
+from mega_dados import COLUNAS_DEZENAS, NUM_DEZENAS_TOTAL
+
+# Os vetores por dezena têm NUM_DEZENAS_TOTAL + 1 posições: o índice é a própria
+# dezena e a posição 0 absorve os zeros das linhas incompletas.
+TAMANHO_VETOR = NUM_DEZENAS_TOTAL + 1
+
+
+def eh_primo(n):
+    if n < 2:
+        return False
+    for i in range(2, int(n**0.5) + 1):
+        if n % i == 0:
+            return False
+    return True
+
+
+# Tabelas de consulta indexadas pela dezena (posição 0 = linha incompleta).
+DEZENAS = np.arange(TAMANHO_VETOR)
+EH_VALIDA = DEZENAS > 0
+EH_PRIMO = np.array([eh_primo(d) for d in DEZENAS])
+EH_PAR = EH_VALIDA & (DEZENAS % 2 == 0)
+DECADA = np.where(EH_VALIDA, (DEZENAS - 1) // 10, -1)   # 01-10 -> 0, ..., 51-60 -> 5
+COLUNA = np.where(EH_VALIDA, (DEZENAS - 1) % 10, -1)    # coluna no volante
+NUM_DECADAS = NUM_DEZENAS_TOTAL // 10
+
+
+def _dezenas_validas(dezenas):
+    dezenas = np.asarray(dezenas).ravel()
+    return np.where((dezenas > 0) & (dezenas <= NUM_DEZENAS_TOTAL), dezenas, 0)
+
+
+def frequencia_por_dezena(dezenas):
+    """Quantas vezes cada dezena saiu em uma matriz (n_concursos, 6)."""
+    return np.bincount(_dezenas_validas(dezenas), minlength=TAMANHO_VETOR)
+
+
+def ultimo_concurso_por_dezena(dezenas, concursos):
+    """Último concurso em que cada dezena saiu (-1 se nunca saiu), em uma única passada."""
+    dezenas = np.asarray(dezenas)
+    ultimo = np.full(TAMANHO_VETOR, -1, dtype=np.int64)
+    concursos_por_bola = np.repeat(np.asarray(concursos, dtype=np.int64), dezenas.shape[1])
+    np.maximum.at(ultimo, _dezenas_validas(dezenas), concursos_por_bola)
+    ultimo[0] = -1
+    return ultimo
+
+
+def atraso_por_dezena(ultimo, concurso_mais_recente, total_concursos):
+    return np.where(ultimo >= 0, concurso_mais_recente - ultimo, total_concursos)
+
+
+def montar_frequencia_e_atraso(vezes, atraso):
+    return pd.DataFrame({
+        'Dezena': np.arange(1, TAMANHO_VETOR),
+        'Vezes': np.asarray(vezes[1:], dtype=int),
+        'Atraso': np.asarray(atraso[1:], dtype=int),
+    })
+
+
+def get_frequencia_e_atraso(df_completo, df_base_completa=None):
+    if df_base_completa is None:
+        df_base_completa = df_completo
+
+    vezes = frequencia_por_dezena(df_completo[COLUNAS_DEZENAS].to_numpy())
+    ultimo = ultimo_concurso_por_dezena(df_base_completa[COLUNAS_DEZENAS].to_numpy(), df_base_completa.index.to_numpy())
+    atraso = atraso_por_dezena(ultimo, df_base_completa.index.max(), len(df_base_completa))
+    return montar_frequencia_e_atraso(vezes, atraso)
+
+
+class IndiceOcorrencias:
+    """Contagens acumuladas por concurso: a frequência de qualquer janela vira uma subtração de linhas."""
+
+    def __init__(self, concursos, dezenas):
+        self.concursos = np.asarray(concursos, dtype=np.int64)
+        dezenas = np.asarray(dezenas)
+        n = len(self.concursos)
+
+        dtype = np.uint16 if n < np.iinfo(np.uint16).max else np.int32
+        ocorrencias = np.zeros((n, TAMANHO_VETOR), dtype=dtype)
+        ocorrencias[np.repeat(np.arange(n), dezenas.shape[1]), _dezenas_validas(dezenas)] = 1
+        self.acumulado = np.zeros((n + 1, TAMANHO_VETOR), dtype=dtype)
+        np.cumsum(ocorrencias, axis=0, out=self.acumulado[1:])
+
+        # O atraso é sempre medido contra o histórico inteiro, então não depende da janela.
+        self.ultimo = ultimo_concurso_por_dezena(dezenas, self.concursos)
+        concurso_mais_recente = self.concursos[-1] if n else 0
+        self.atraso = atraso_por_dezena(self.ultimo, concurso_mais_recente, n)
+
+        # Um uint64 por concurso (bit d-1 = dezena d): conferir jogos vira AND + popcount
+        self.mascaras = mascaras_concursos(dezenas)
+
+    def acrescentado(self, concursos_novos, dezenas_novas):
+        """Novo índice com os concursos novos no fim; só as linhas novas são processadas.
+
+        O índice atual não é alterado (outras sessões podem estar lendo), então os arrays
+        são concatenados em cópias novas.
+        """
+        novo = copy.copy(self)
+        concursos_novos = np.asarray(concursos_novos, dtype=np.int64)
+        dezenas_novas = np.asarray(dezenas_novas)
+        k = len(concursos_novos)
+        n = len(self.concursos) + k
+        novo.concursos = np.concatenate([self.concursos, concursos_novos])
+
+        acumulado = self.acumulado
+        if n >= np.iinfo(acumulado.dtype).max:
+            acumulado = acumulado.astype(np.int32)
+        ocorrencias = np.zeros((k, TAMANHO_VETOR), dtype=acumulado.dtype)
+        ocorrencias[np.repeat(np.arange(k), dezenas_novas.shape[1]), _dezenas_validas(dezenas_novas)] = 1
+        novo.acumulado = np.concatenate([acumulado, acumulado[-1] + np.cumsum(ocorrencias, axis=0, dtype=acumulado.dtype)])
+
+        novo.ultimo = np.maximum(self.ultimo, ultimo_concurso_por_dezena(dezenas_novas, concursos_novos))
+        novo.ultimo[0] = -1
+        novo.atraso = atraso_por_dezena(novo.ultimo, novo.concursos[-1] if n else 0, n)
+        novo.mascaras = np.concatenate([self.mascaras, mascaras_concursos(dezenas_novas)])
+        return novo
+
+    def posicoes(self, concurso_inicio, concurso_fim):
+        """Intervalo [i0, i1) de linhas cobertas pelos concursos [inicio, fim]."""
+        i0 = int(np.searchsorted(self.concursos, concurso_inicio, side='left'))
+        i1 = int(np.searchsorted(self.concursos, concurso_fim, side='right'))
+        return i0, max(i0, i1)
+
+    def frequencia(self, concurso_inicio, concurso_fim):
+        i0, i1 = self.posicoes(concurso_inicio, concurso_fim)
+        return self.acumulado[i1].astype(np.int64) - self.acumulado[i0]
+
+    def frequencia_e_atraso(self, concurso_inicio, concurso_fim):
+        return montar_frequencia_e_atraso(self.frequencia(concurso_inicio, concurso_fim), self.atraso)
+
+    def atraso_na_janela(self, concurso_inicio, concurso_fim):
+        """Atraso no fim da janela contando só os concursos dela (o tamanho da janela se a dezena não saiu nela).
+
+        Busca binária no acumulado, as 60 dezenas juntas: a primeira linha p com o mesmo
+        acumulado do fim da janela vem logo depois da última saída da dezena.
+        """
+        i0, i1 = self.posicoes(concurso_inicio, concurso_fim)
+        alvo = self.acumulado[i1]
+        colunas = np.arange(TAMANHO_VETOR)
+        baixo = np.full(TAMANHO_VETOR, i0, dtype=np.int64)
+        alto = np.full(TAMANHO_VETOR, i1, dtype=np.int64)
+        while (baixo < alto).any():
+            meio = (baixo + alto) // 2
+            atingiu = self.acumulado[meio, colunas] >= alvo
+            alto = np.where(atingiu, meio, alto)
+            baixo = np.where(atingiu, baixo, meio + 1)
+        return i1 - baixo
+
+    def serie_janelas(self, largura, passo=1):
+        """Frequência das 60 dezenas em janelas de `largura` concursos que andam de `passo` em `passo`.
+
+        Cada janela é a diferença de duas linhas do acumulado, então o custo é O(janelas x 60)
+        qualquer que seja a largura. As janelas terminam no concurso mais recente e voltam
+        até o início; o DataFrame tem uma linha por janela (índice: último concurso dela).
+        """
+        n = len(self.concursos)
+        largura = min(max(1, int(largura)), n)
+        fins = np.arange(n, largura - 1, -max(1, int(passo)))[::-1] if n else np.arange(0)
+        frequencias = self.acumulado[fins].astype(np.int32) - self.acumulado[fins - largura]
+        return pd.DataFrame(
+            frequencias[:, 1:],
+            index=pd.Index(self.concursos[fins - 1], name='Concurso'),
+            columns=pd.Index(np.arange(1, TAMANHO_VETOR), name='Dezena'),
+        )
+
+
+# Pares (i < j) na ordem de np.triu_indices: a posição k representa o par (PARES_D1[k], PARES_D2[k]).
+PARES_D1, PARES_D2 = (v + 1 for v in np.triu_indices(NUM_DEZENAS_TOTAL, k=1))
+
+
+def matriz_ocorrencias(dezenas):
+    """Matriz one-hot (n_concursos, 61): 1 onde a dezena saiu no concurso."""
+    dezenas = np.asarray(dezenas)
+    n = len(dezenas)
+    ocorrencias = np.zeros((n, TAMANHO_VETOR), dtype=np.uint8)
+    ocorrencias[np.repeat(np.arange(n), dezenas.shape[1]), _dezenas_validas(dezenas)] = 1
+    ocorrencias[:, 0] = 0
+    return ocorrencias
+
+
+# Linhas por bloco em _produto_contagens: cada soma parcial fica abaixo de 2**24 e o float32 é exato
+LINHAS_POR_BLOCO_PRODUTO = 1 << 16
+
+
+def _produto_contagens(a, b):
+    """aᵀ·b de matrizes 0/1 (n, k) como contagens int64.
+
+    O matmul de inteiros do NumPy não usa BLAS e, com o operando transposto, cresce
+    muito pior que linear no número de linhas; em blocos float32 o BLAS faz a conta
+    exata com memória limitada ao bloco.
+    """
+    resultado = np.zeros((a.shape[1], b.shape[1]), dtype=np.int64)
+    for inicio in range(0, len(a), LINHAS_POR_BLOCO_PRODUTO):
+        fim = inicio + LINHAS_POR_BLOCO_PRODUTO
+        resultado += (a[inicio:fim].T.astype(np.float32) @ b[inicio:fim].astype(np.float32)).astype(np.int64)
+    return resultado
+
+
+def _coocorrencia(ocorrencias):
+    return _produto_contagens(ocorrencias, ocorrencias)[PARES_D1, PARES_D2]
+
+
+def contagens_pares(dezenas):
+    """Quantas vezes cada um dos 1770 pares saiu junto, via Aᵀ·A da matriz one-hot."""
+    return _coocorrencia(matriz_ocorrencias(dezenas)).astype(np.int64)
+
+
+def matriz_pares(contagens):
+    """Expande o vetor de 1770 pares na matriz simétrica 60x60 (diagonal zerada)."""
+    matriz = np.zeros((NUM_DEZENAS_TOTAL, NUM_DEZENAS_TOTAL), dtype=np.int64)
+    matriz[PARES_D1 - 1, PARES_D2 - 1] = contagens
+    return matriz + matriz.T
+
+
+def _maiores(valores, top_n):
+    """Índices dos top_n maiores valores (empates pela menor posição), sem ordenar o vetor todo."""
+    if top_n is None or top_n >= len(valores):
+        candidatos = np.arange(len(valores))
+    elif top_n <= 0:
+        candidatos = np.arange(0)
+    else:
+        limiar = np.partition(valores, len(valores) - top_n)[len(valores) - top_n]
+        acima = np.flatnonzero(valores > limiar)
+        empatados = np.flatnonzero(valores == limiar)[:top_n - len(acima)]
+        candidatos = np.concatenate([acima, empatados])
+    return candidatos[np.lexsort((candidatos, -valores[candidatos]))]
+
+
+def tabela_pares(contagens, top_n=None):
+    contagens = np.asarray(contagens)
+    idx = _maiores(contagens, top_n)
+    idx = idx[contagens[idx] > 0]
+    d1, d2 = PARES_D1[idx], PARES_D2[idx]
+    return pd.DataFrame({
+        'Par': list(zip(d1.tolist(), d2.tolist())),
+        'Frequencia': contagens[idx].astype(np.int64),
+        'Dezena 1': d1,
+        'Dezena 2': d2,
+    })
+
+
+def calcular_frequencia_pares(df_analise, top_n=None):
+    return tabela_pares(contagens_pares(df_analise[COLUNAS_DEZENAS].to_numpy()), top_n)
+
+
+class _AcumuladoPorBlocos:
+    """Contagens acumuladas a cada `passo` concursos.
+
+    Guardar o acumulado só nas fronteiras de bloco mantém a memória limitada mesmo
+    em históricos enormes: a janela soma a diferença dos blocos inteiros com as
+    pontas (menos de `passo` linhas cada) contadas direto. `linhas` tem uma linha por
+    concurso e `contar(linhas[i:j])` devolve o vetor de `tamanho` contagens do trecho.
+    """
+
+    def __init__(self, linhas, contar, passo, tamanho):
+        self.linhas = linhas
+        self.contar = contar
+        self.passo = passo
+        n_blocos = len(linhas) // passo
+        self.acumulado = np.zeros((n_blocos + 1, tamanho), dtype=np.int32)
+        for b in range(n_blocos):
+            self.acumulado[b + 1] = self.acumulado[b] + self._contar(b * passo, (b + 1) * passo)
+
+    def acrescentado(self, linhas):
+        """Novo índice para `linhas` estendidas no fim: só os blocos completados pelas linhas novas são somados."""
+        novo = copy.copy(self)
+        novo.linhas = linhas
+        n_blocos = len(self.acumulado) - 1
+        novos_blocos = len(linhas) // self.passo - n_blocos
+        if novos_blocos > 0:
+            acumulado = np.empty((n_blocos + novos_blocos + 1, self.acumulado.shape[1]), dtype=self.acumulado.dtype)
+            acumulado[:n_blocos + 1] = self.acumulado
+            for b in range(n_blocos, n_blocos + novos_blocos):
+                acumulado[b + 1] = acumulado[b] + novo._contar(b * self.passo, (b + 1) * self.passo)
+            novo.acumulado = acumulado
+        return novo
+
+    def _contar(self, pos_inicio, pos_fim):
+        return self.contar(self.linhas[pos_inicio:pos_fim])
+
+    def contagens(self, pos_inicio, pos_fim):
+        """Contagens nas linhas [pos_inicio, pos_fim)."""
+        b0 = -(-pos_inicio // self.passo)
+        b1 = pos_fim // self.passo
+        if b0 >= b1:
+            return self._contar(pos_inicio, pos_fim).astype(np.int64)
+        return (
+            self.acumulado[b1].astype(np.int64) - self.acumulado[b0]
+            + self._contar(pos_inicio, b0 * self.passo)
+            + self._contar(b1 * self.passo, pos_fim)
+        )
+
+
+class IndicePares(_AcumuladoPorBlocos):
+    """Coocorrência dos 1770 pares, acumulada por blocos de concursos."""
+
+    def __init__(self, dezenas, passo=None, ocorrencias=None):
+        # A matriz one-hot pode vir pronta, compartilhada com o IndiceTransicoes
+        ocorrencias = matriz_ocorrencias(dezenas) if ocorrencias is None else ocorrencias
+        n = len(ocorrencias)
+        super().__init__(ocorrencias, _coocorrencia, passo or max(32, -(-n // 2048)), len(PARES_D1))
+
+
+# Trios codificados pelo sistema combinatório (ordem colex): o trio a < b < c vira
+# C(a-1, 1) + C(b-1, 2) + C(c-1, 3), um índice único em [0, C(60, 3)).
+_A = np.maximum(np.arange(TAMANHO_VETOR) - 1, 0)
+_COMB_1, _COMB_2, _COMB_3 = _A, _A * (_A - 1) // 2, _A * (_A - 1) * (_A - 2) // 6
+TRIOS = np.array(list(combinations(range(1, TAMANHO_VETOR), 3)), dtype=np.int16)
+TRIOS = TRIOS[np.argsort(_COMB_1[TRIOS[:, 0]] + _COMB_2[TRIOS[:, 1]] + _COMB_3[TRIOS[:, 2]])]
+_COLUNAS_TRIOS = np.array(list(combinations(range(len(COLUNAS_DEZENAS)), 3)))
+
+
+def chaves_trios(dezenas):
+    """Índice colex de cada um dos 20 trios de cada concurso (-1 para trios com zero)."""
+    ordenadas = np.sort(np.where(np.asarray(dezenas) <= NUM_DEZENAS_TOTAL, dezenas, 0), axis=1)
+    a, b, c = (ordenadas[:, _COLUNAS_TRIOS[:, k]] for k in range(3))
+    chaves = _COMB_1[a] + _COMB_2[b] + _COMB_3[c]
+    return np.where(a > 0, chaves, -1)
+
+
+def _contar_chaves_trios(chaves):
+    chaves = chaves.ravel()
+    return np.bincount(chaves[chaves >= 0], minlength=len(TRIOS))
+
+
+def contagens_trios(dezenas):
+    return _contar_chaves_trios(chaves_trios(dezenas)).astype(np.int64)
+
+
+def tabela_trios(contagens, top_n=None):
+    contagens = np.asarray(contagens)
+    idx = _maiores(contagens, top_n)
+    idx = idx[contagens[idx] > 0]
+    trios = TRIOS[idx].astype(np.int64)
+    return pd.DataFrame({
+        'Trio': list(map(tuple, trios.tolist())),
+        'Frequencia': contagens[idx].astype(np.int64),
+        'D1': trios[:, 0],
+        'D2': trios[:, 1],
+        'D3': trios[:, 2],
+    })
+
+
+def calcular_frequencia_trios(df_analise, top_n=None):
+    return tabela_trios(contagens_trios(df_analise[COLUNAS_DEZENAS].to_numpy()), top_n)
+
+
+class IndiceTrios(_AcumuladoPorBlocos):
+    """Contagem dos 34.220 trios, acumulada por blocos de concursos."""
+
+    def __init__(self, dezenas, passo=None):
+        chaves = chaves_trios(dezenas)
+        n = len(chaves)
+        # Cada bloco guarda C(60, 3) contadores: poucos blocos mantêm o índice em dezenas de MB.
+        super().__init__(chaves, _contar_chaves_trios, passo or max(64, -(-n // 256)), len(TRIOS))
+
+    def acrescentado(self, dezenas_novas):
+        return super().acrescentado(np.concatenate([self.linhas, chaves_trios(dezenas_novas)]))
+
+
+class IndiceIntervalos:
+    """Aparições de cada dezena em formato CSR: os concursos da dezena d são
+    `aparicoes[inicio[d]:inicio[d + 1]]`, em ordem crescente.
+
+    Montado em uma passada (ordenação estável das posições por dezena). Os intervalos
+    (diferença entre aparições consecutivas) seguem o mesmo layout, com uma posição a
+    menos por dezena, e ficam ordenados por dezena para percentis e ranks por busca binária.
+    """
+
+    def __init__(self, concursos, dezenas):
+        concursos = np.asarray(concursos, dtype=np.int64)
+        dezenas = np.asarray(dezenas)
+        self.concurso_mais_recente = int(concursos[-1]) if len(concursos) else 0
+        self.total_concursos = len(concursos)
+
+        bolas = _dezenas_validas(dezenas)
+        linhas = np.repeat(np.arange(len(concursos)), dezenas.shape[1])
+        validas = bolas > 0
+        bolas, linhas = bolas[validas], linhas[validas]
+        # Estável: dentro de cada dezena as linhas continuam em ordem crescente.
+        # Em uint8 vira radix sort no NumPy: linear no número de bolas
+        ordem = np.argsort(bolas.astype(np.uint8), kind='stable')
+        self.aparicoes = concursos[linhas[ordem]]
+        quantidades = np.bincount(bolas, minlength=TAMANHO_VETOR)
+        self.inicio = np.zeros(TAMANHO_VETOR + 1, dtype=np.int64)
+        np.cumsum(quantidades, out=self.inicio[1:])
+
+        # Intervalos: diferenças dentro de cada dezena (descarta a fronteira entre dezenas)
+        diferencas = np.diff(self.aparicoes)
+        mesma_dezena = np.ones(len(diferencas), dtype=bool)
+        fronteiras = self.inicio[(self.inicio > 0) & (self.inicio < len(self.aparicoes))]
+        mesma_dezena[fronteiras - 1] = False
+        self.intervalos = diferencas[mesma_dezena]
+        por_dezena = np.maximum(quantidades - 1, 0)
+        self.inicio_intervalos = np.zeros(TAMANHO_VETOR + 1, dtype=np.int64)
+        np.cumsum(por_dezena, out=self.inicio_intervalos[1:])
+        dono = np.repeat(np.arange(TAMANHO_VETOR), por_dezena)
+        # Ordena por (dezena, intervalo) de uma vez, com a dezena nos bits altos da chave
+        self._ordenados = np.sort((dono << 32) | self.intervalos) & 0xFFFFFFFF
+
+    def acrescentado(self, concursos_novos, dezenas_novas):
+        """Novo índice com os concursos novos: cada aparição nova entra no fim do trecho da sua dezena.
+
+        O custo de cálculo é proporcional às linhas novas; os arrays são copiados com
+        np.insert para o índice atual continuar valendo para quem ainda o usa.
+        """
+        concursos_novos = np.asarray(concursos_novos, dtype=np.int64)
+        dezenas_novas = np.asarray(dezenas_novas)
+        bolas = _dezenas_validas(dezenas_novas)
+        linhas = np.repeat(np.arange(len(concursos_novos)), dezenas_novas.shape[1])
+        validas = bolas > 0
+        ordem = np.argsort(bolas[validas], kind='stable')
+        bolas = bolas[validas][ordem]
+        aparicoes = concursos_novos[linhas[validas][ordem]]
+
+        # Aparição anterior de cada nova: a nova anterior da mesma dezena ou a última antiga
+        primeira = np.ones(len(bolas), dtype=bool)
+        primeira[1:] = bolas[1:] != bolas[:-1]
+        anterior = np.empty(len(bolas), dtype=np.int64)
+        anterior[1:] = aparicoes[:-1]
+        tem_antiga = self.inicio[bolas + 1] > self.inicio[bolas]
+        anterior[primeira] = np.where(
+            tem_antiga[primeira], self.aparicoes[np.maximum(self.inicio[bolas[primeira] + 1] - 1, 0)], -1
+        )
+        com_intervalo = anterior >= 0
+        intervalos = (aparicoes - anterior)[com_intervalo]
+        bolas_intervalos = bolas[com_intervalo]
+
+        novo = copy.copy(self)
+        novo.concurso_mais_recente = int(concursos_novos[-1]) if len(concursos_novos) else self.concurso_mais_recente
+        novo.total_concursos = self.total_concursos + len(concursos_novos)
+        novo.aparicoes = np.insert(self.aparicoes, self.inicio[bolas + 1], aparicoes)
+        novo.inicio = self.inicio + np.concatenate([[0], np.cumsum(np.bincount(bolas, minlength=TAMANHO_VETOR))])
+        novo.intervalos = np.insert(self.intervalos, self.inicio_intervalos[bolas_intervalos + 1], intervalos)
+        novo.inicio_intervalos = self.inicio_intervalos + np.concatenate(
+            [[0], np.cumsum(np.bincount(bolas_intervalos, minlength=TAMANHO_VETOR))]
+        )
+        # Nos ordenados, cada intervalo novo entra na posição da busca binária dentro do trecho da dezena
+        ordem = np.lexsort((intervalos, bolas_intervalos))
+        bolas_intervalos, intervalos = bolas_intervalos[ordem], intervalos[ordem]
+        posicoes = np.array([
+            self.inicio_intervalos[d] + np.searchsorted(
+                self._ordenados[self.inicio_intervalos[d]:self.inicio_intervalos[d + 1]], g, side='right'
+            )
+            for d, g in zip(bolas_intervalos.tolist(), intervalos.tolist())
+        ], dtype=np.int64)
+        novo._ordenados = np.insert(self._ordenados, posicoes, intervalos)
+        return novo
+
+    def concursos_da_dezena(self, dezena):
+        """Concursos em que a dezena saiu (view, sem varrer a tabela)."""
+        return self.aparicoes[self.inicio[dezena]:self.inicio[dezena + 1]]
+
+    def intervalos_da_dezena(self, dezena):
+        return self.intervalos[self.inicio_intervalos[dezena]:self.inicio_intervalos[dezena + 1]]
+
+    def atraso(self, dezena):
+        aparicoes = self.concursos_da_dezena(dezena)
+        return self.concurso_mais_recente - int(aparicoes[-1]) if len(aparicoes) else self.total_concursos
+
+    def percentil_atraso(self, dezena, atraso=None):
+        """% dos intervalos passados que o atraso atual já igualou ou superou.
+
+        Um intervalo g terminou quando o atraso chegava a g, então atraso >= g quer dizer
+        que a espera atual já é pelo menos tão longa quanto aquele intervalo.
+        """
+        atraso = self.atraso(dezena) if atraso is None else atraso
+        ordenados = self._ordenados[self.inicio_intervalos[dezena]:self.inicio_intervalos[dezena + 1]]
+        if len(ordenados) == 0:
+            return np.nan
+        return 100 * np.searchsorted(ordenados, atraso, side='right') / len(ordenados)
+
+    def tabela(self):
+        """Estatísticas dos intervalos de cada dezena e o quão incomum é o atraso atual."""
+        linhas = []
+        for d in range(1, TAMANHO_VETOR):
+            intervalos = self.intervalos_da_dezena(d)
+            atraso = self.atraso(d)
+            tem = len(intervalos) > 0
+            p50, p90, p95 = np.percentile(intervalos, [50, 90, 95]) if tem else (np.nan,) * 3
+            linhas.append({
+                'Dezena': d,
+                'Aparições': int(self.inicio[d + 1] - self.inicio[d]),
+                'Intervalo Médio': float(intervalos.mean()) if tem else np.nan,
+                'Intervalo Mediano': p50,
+                'P90': p90,
+                'P95': p95,
+                'Intervalo Máximo': int(intervalos.max()) if tem else 0,
+                'Atraso': atraso,
+                'Percentil do Atraso': self.percentil_atraso(d, atraso),
+            })
+        return pd.DataFrame(linhas)
+
+
+class TransicoesJanela:
+    """Matriz 61x61 "saiu no concurso c -> saiu no concurso c+1" de uma janela, em uma passada.
+
+    A linha r conta as dezenas do concurso seguinte a cada concurso com a dezena r;
+    `base[r]` é quantos concursos com r têm sucessor na janela (denominador do percentual).
+    """
+
+    def __init__(self, concursos, ocorrencias, atraso):
+        concursos = np.asarray(concursos)
+        consecutivos = concursos[1:] == concursos[:-1] + 1
+        atual = ocorrencias[:-1][consecutivos]
+        seguinte = ocorrencias[1:][consecutivos]
+        self.matriz = _produto_contagens(atual, seguinte)
+        self.base = atual.sum(axis=0, dtype=np.int64)
+        self.atraso = atraso
+
+    @classmethod
+    def de_dezenas(cls, concursos, dezenas):
+        ultimo = ultimo_concurso_por_dezena(dezenas, concursos)
+        concurso_atual = concursos[-1] if len(concursos) else 0
+        atraso = atraso_por_dezena(ultimo, concurso_atual, len(concursos))
+        return cls(concursos, matriz_ocorrencias(dezenas), atraso)
+
+    def sequencia(self, dezena_referencia, top_n=15):
+        if not 0 < dezena_referencia <= NUM_DEZENAS_TOTAL or self.base[dezena_referencia] == 0:
+            return pd.DataFrame()
+        linha = self.matriz[dezena_referencia]
+        idx = _maiores(linha, top_n)
+        idx = idx[linha[idx] > 0]
+        return pd.DataFrame({
+            'Dezena': [str(d).zfill(2) for d in idx.tolist()],
+            'Frequência': linha[idx].astype(np.int64),
+            'Percentual': linha[idx] / self.base[dezena_referencia] * 100,
+            'Atraso': self.atraso[idx].astype(np.int64),
+        })
+
+
+def analisar_sequencias_dezenas(df_completo, dezena_referencia, top_n=15):
+    transicoes = TransicoesJanela.de_dezenas(df_completo.index.to_numpy(), df_completo[COLUNAS_DEZENAS].to_numpy())
+    return transicoes.sequencia(dezena_referencia, top_n)
+
+
+class IndiceTransicoes:
+    """Guarda a matriz one-hot do histórico e memoriza as matrizes de transição das últimas janelas."""
+
+    MAX_JANELAS = 8
+
+    def __init__(self, concursos, dezenas, ocorrencias=None):
+        self.concursos = np.asarray(concursos, dtype=np.int64)
+        self.dezenas = np.asarray(dezenas)
+        self.ocorrencias = matriz_ocorrencias(self.dezenas) if ocorrencias is None else ocorrencias
+        self._janelas = {}
+        # O índice pode ser compartilhado entre sessões (threads): a memória de janelas fica sob lock
+        self._lock = threading.Lock()
+
+    def acrescentado(self, concursos_novos, dezenas_novas, ocorrencias):
+        """Novo índice com as linhas novas; as janelas já calculadas continuam válidas (só se acrescenta no fim)."""
+        novo = IndiceTransicoes(
+            np.concatenate([self.concursos, np.asarray(concursos_novos, dtype=np.int64)]),
+            np.concatenate([self.dezenas, np.asarray(dezenas_novas, dtype=self.dezenas.dtype)]),
+            ocorrencias=ocorrencias,
+        )
+        with self._lock:
+            novo._janelas = dict(self._janelas)
+        return novo
+
+    def janela(self, pos_inicio, pos_fim):
+        chave = (pos_inicio, pos_fim)
+        with self._lock:
+            transicoes = self._janelas.pop(chave, None)
+            if transicoes is None:
+                concursos = self.concursos[pos_inicio:pos_fim]
+                # Atraso relativo à própria janela, como no cálculo original por dezena
+                ultimo = ultimo_concurso_por_dezena(self.dezenas[pos_inicio:pos_fim], concursos)
+                atraso = atraso_por_dezena(ultimo, concursos[-1] if len(concursos) else 0, len(concursos))
+                transicoes = TransicoesJanela(concursos, self.ocorrencias[pos_inicio:pos_fim], atraso)
+                while len(self._janelas) >= self.MAX_JANELAS:
+                    self._janelas.pop(next(iter(self._janelas)))
+            self._janelas[chave] = transicoes
+            return transicoes
+
+
+def _contar_distintos(rotulos, tamanho):
+    presentes = np.zeros((len(rotulos), tamanho + 1), dtype=bool)
+    presentes[np.arange(len(rotulos))[:, None], rotulos] = True
+    return presentes[:, :tamanho].sum(axis=1)
+
+
+def _distribuicao(valores, nome, inicio=0, tamanho=None):
+    contagem = np.bincount(valores - inicio, minlength=tamanho or 0)
+    return pd.DataFrame({nome: np.arange(inicio, inicio + len(contagem)), 'Concursos': contagem})
+
+
+def padroes_por_concurso(concursos, dezenas):
+    """Pares, ímpares, primos, soma e espalhamento de cada concurso, via tabelas de consulta."""
+    dezenas = np.where(np.asarray(dezenas) <= NUM_DEZENAS_TOTAL, dezenas, 0)
+    validas = EH_VALIDA[dezenas].sum(axis=1)
+    pares = EH_PAR[dezenas].sum(axis=1)
+    return pd.DataFrame({
+        'Pares': pares,
+        'Impares': validas - pares,
+        'Primos': EH_PRIMO[dezenas].sum(axis=1),
+        'Soma': dezenas.sum(axis=1),
+        # Rótulo -1 (linha incompleta) cai na última coluna e é descartado na contagem
+        'Decadas': _contar_distintos(DECADA[dezenas], NUM_DECADAS),
+        'Colunas': _contar_distintos(COLUNA[dezenas], 10),
+    }, index=pd.Index(np.asarray(concursos), name='Concurso'))
+
+
+def analisar_padroes_avancados(df_analise):
+    return resumir_padroes(df_analise.index.to_numpy(), df_analise[COLUNAS_DEZENAS].to_numpy())
+
+
+def resumir_padroes(concursos, dezenas):
+    """Médias e distribuições dos padrões de uma janela, direto das fatias de arrays."""
+    por_concurso = padroes_por_concurso(concursos, dezenas)
+    dist_soma = _distribuicao(por_concurso['Soma'].to_numpy() // 10, 'Soma')
+    dist_soma['Soma'] *= 10   # início de cada faixa de 10
+    return {
+        'Pares_Medio': por_concurso['Pares'].mean(),
+        'Impares_Medio': por_concurso['Impares'].mean(),
+        'Primos_Medio': por_concurso['Primos'].mean(),
+        'Soma_Media': por_concurso['Soma'].mean(),
+        'Por_Concurso': por_concurso,
+        'Dist_Pares': _distribuicao(por_concurso['Pares'].to_numpy(), 'Pares', tamanho=len(COLUNAS_DEZENAS) + 1),
+        'Dist_Primos': _distribuicao(por_concurso['Primos'].to_numpy(), 'Primos', tamanho=len(COLUNAS_DEZENAS) + 1),
+        'Dist_Decadas': _distribuicao(por_concurso['Decadas'].to_numpy(), 'Decadas', inicio=1, tamanho=NUM_DECADAS),
+        'Dist_Soma': dist_soma[dist_soma['Concursos'] > 0],
+    }
@@ -0,0 +1,88 @@
+import numpy as np
+
+# Núcleo das estratégias sobre vetores: vezes[i] e atraso[i] descrevem a dezena i + 1.
+# As versões gerar_jogo_* recebem o DataFrame Dezena/Vezes/Atraso usado pelo app e
+# delegam para cá, então o app e o backtest escolhem exatamente os mesmos jogos.
+
+
+def _ordem_decrescente(valores):
+    # Ordenação estável: empates ficam com a dezena menor primeiro.
+    return np.argsort(-np.asarray(valores, dtype=float), kind='stable')
+
+
+def _jogo(posicoes):
+    return sorted(int(p) + 1 for p in posicoes)
+
+
+def escolher_otimizado(vezes, atraso, num_dezenas=6, rng=None):
+    score = np.asarray(vezes) * 1.5 + np.asarray(atraso) * 0.5
+    return _jogo(_ordem_decrescente(score)[:num_dezenas])
+
+
+def escolher_quentes(vezes, atraso, num_dezenas=6, rng=None):
+    return _jogo(_ordem_decrescente(vezes)[:num_dezenas])
+
+
+def escolher_atrasadas(vezes, atraso, num_dezenas=6, rng=None):
+    return _jogo(_ordem_decrescente(atraso)[:num_dezenas])
+
+
+def escolher_balanceado(vezes, atraso, num_dezenas=6, rng=None):
+    metade = num_dezenas // 2
+    selecionadas = set(_ordem_decrescente(vezes)[:metade].tolist())
+    selecionadas.update(_ordem_decrescente(atraso)[:num_dezenas - metade].tolist())
+    # Se quentes e atrasadas se sobrepõem, completa com as menores dezenas restantes
+    for p in range(len(vezes)):
+        if len(selecionadas) >= num_dezenas:
+            break
+        selecionadas.add(p)
+    return _jogo(selecionadas)
+
+
+def escolher_aleatorio_inteligente(vezes, atraso, num_dezenas=6, rng=None):
+    rng = rng or np.random.default_rng()
+    # Pool de 20 dezenas com base em um Score (Frequência > Atraso)
+    score = np.asarray(vezes) * 0.7 + np.asarray(atraso) * 0.3
+    top = _ordem_decrescente(score)[:20]
+    return _jogo(rng.choice(top, size=min(num_dezenas, len(top)), replace=False))
+
+
+def escolher_aleatorio(vezes, atraso, num_dezenas=6, rng=None):
+    rng = rng or np.random.default_rng()
+    return _jogo(rng.choice(len(vezes), size=num_dezenas, replace=False))
+
+
+def _aplicar(escolher, df_freq_e_atraso, num_dezenas):
+    posicoes = [d - 1 for d in escolher(df_freq_e_atraso['Vezes'].to_numpy(), df_freq_e_atraso['Atraso'].to_numpy(), num_dezenas)]
+    return sorted(int(d) for d in df_freq_e_atraso['Dezena'].to_numpy()[posicoes])
+
+
+def gerar_jogo_otimizado(df_freq_e_atraso, num_dezenas=6):
+    return _aplicar(escolher_otimizado, df_freq_e_atraso, num_dezenas)
+
+
+def gerar_jogo_quentes(df_freq_e_atraso, num_dezenas=6):
+    return _aplicar(escolher_quentes, df_freq_e_atraso, num_dezenas)
+
+
+def gerar_jogo_atrasadas(df_freq_e_atraso, num_dezenas=6):
+    return _aplicar(escolher_atrasadas, df_freq_e_atraso, num_dezenas)
+
+
+def gerar_jogo_balanceado(df_freq_e_atraso, num_dezenas=6):
+    return _aplicar(escolher_balanceado, df_freq_e_atraso, num_dezenas)
+
+
+def gerar_jogo_aleatorio_inteligente(df_freq_e_atraso, num_dezenas=6):
+    return _aplicar(escolher_aleatorio_inteligente, df_freq_e_atraso, num_dezenas)
+
+
+# Estratégias comparadas no backtest; a aleatória pura é a linha de base.
+ESTRATEGIAS = {
+    'Otimizada': escolher_otimizado,
+    'Quentes': escolher_quentes,
+    'Atrasadas': escolher_atrasadas,
+    'Balanceada': escolher_balanceado,
+    'Aleatória Inteligente': escolher_aleatorio_inteligente,
+    'Aleatória Pura': escolher_aleatorio,
+}
@@ -0,0 +1,188 @@
+import random
+import time
+from itertools import combinations
+from math import ceil, comb, exp
+
+import numpy as np
+
+from mega_bitsets import BIT_DEZENA, dezenas_da_mascara, matriz_acertos
+from mega_dados import NUM_DEZENAS_SORTEADAS
+
+# Fechamento (desdobramento reduzido) "t se m": para qualquer m dezenas sorteadas dentro do
+# pool, pelo menos um jogo acerta t delas. Jogos candidatos e alvos (as m-combinações do pool)
+# são máscaras de 64 bits; a cobertura é AND + popcount. O guloso dá a primeira solução e,
+# no tempo restante, o recozimento simulado (Nurmela-Östergård) tenta cobrir tudo com um jogo
+# a menos, trocando jogos para diminuir o número de alvos descobertos.
+GARANTIAS = {
+    'Quadra se sair 4 (4 se 4)': (4, 4),
+    'Quadra se sair 5 (4 se 5)': (4, 5),
+    'Quadra se sair 6 (4 se 6)': (4, 6),
+    'Quina se sair 5 (5 se 5)': (5, 5),
+    'Quina se sair 6 (5 se 6)': (5, 6),
+    'Terno se sair 3 (3 se 3)': (3, 3),
+}
+# Limite da matriz alvos x candidatos (bytes, 1 por célula)
+MAX_CELULAS_COBERTURA = 1 << 26
+LINHAS_POR_BLOCO = 512
+TEMPERATURA_INICIAL = 1.0
+RESFRIAMENTO = 0.9999
+TEMPERATURA_MINIMA = 0.05
+
+
+def _mascaras_combinacoes(dezenas, tamanho):
+    combos = np.array(list(combinations(dezenas, tamanho)), dtype=np.int64).reshape(-1, tamanho)
+    return np.bitwise_or.reduce(BIT_DEZENA[combos], axis=1)
+
+
+def limite_inferior_schonheim(v, k, t):
+    """Limite de Schönheim para cobrir todas as t-combinações de v dezenas com jogos de k."""
+    limite = 1
+    for i in range(t - 1, -1, -1):
+        limite = ceil((v - i) / (k - i) * limite)
+    return limite
+
+
+def _matriz_cobertura(alvos, candidatos, garantia):
+    """cobre[a, c] = o jogo c acerta pelo menos `garantia` dezenas do alvo a."""
+    cobre = np.empty((len(alvos), len(candidatos)), dtype=bool)
+    for inicio in range(0, len(alvos), LINHAS_POR_BLOCO):
+        bloco = alvos[inicio:inicio + LINHAS_POR_BLOCO]
+        cobre[inicio:inicio + LINHAS_POR_BLOCO] = matriz_acertos(bloco, candidatos) >= garantia
+    return cobre
+
+
+class _Cobertura:
+    def __init__(self, cobre, rng):
+        self.cobre = cobre
+        # Versão uint8 para somar linhas sem converter a cada passo
+        self.cobre_u8 = cobre.view(np.uint8)
+        self.rng = rng
+        self.aleatorio = random.Random(int(rng.integers(1 << 62)))
+        # Listas esparsas para o recozimento: alvos de cada jogo e jogos de cada alvo
+        alvo, jogo = np.nonzero(cobre)
+        ordem = np.argsort(jogo, kind='stable')
+        self.alvos_do_jogo = [tuple(a) for a in np.split(alvo[ordem], np.cumsum(cobre.sum(axis=0))[:-1])]
+        self.jogos_do_alvo = [tuple(j) for j in np.split(jogo, np.cumsum(cobre.sum(axis=1))[:-1])]
+
+    def completar(self, selecionados):
+        """Acrescenta jogos pelo guloso (maior ganho, empate sorteado) até cobrir todos os alvos."""
+        selecionados = list(selecionados)
+        contagem = self.cobre_u8[:, selecionados].sum(axis=1, dtype=np.int32)
+        descobertos = contagem == 0
+        ganho = self.cobre_u8[descobertos].sum(axis=0, dtype=np.int64)
+        while descobertos.any():
+            melhores = np.flatnonzero(ganho == ganho.max())
+            escolhido = int(melhores[self.rng.integers(len(melhores))])
+            novos = descobertos & self.cobre[:, escolhido]
+            ganho -= self.cobre_u8[novos].sum(axis=0, dtype=np.int64)
+            descobertos &= ~novos
+            contagem += self.cobre_u8[:, escolhido]
+            selecionados.append(escolhido)
+        return self.podar(selecionados, contagem)
+
+    def podar(self, selecionados, contagem):
+        """Remove jogos redundantes (todos os seus alvos cobertos por outro jogo)."""
+        mantidos = []
+        for posicao in self.rng.permutation(len(selecionados)):
+            jogo = selecionados[posicao]
+            cobertos = self.cobre[:, jogo]
+            if (contagem[cobertos] >= 2).all():
+                contagem -= self.cobre_u8[:, jogo]
+            else:
+                mantidos.append(jogo)
+        return mantidos
+
+    def recozer(self, jogos, prazo):
+        """Tenta cobrir todos os alvos com exatamente len(jogos) jogos; devolve None se o prazo acabar.
+
+        Cada passo sorteia um alvo descoberto, um jogo que o cobriria e um jogo da solução
+        para sair; a troca é aceita se não aumenta os descobertos, ou com probabilidade
+        exp(-delta / T) se aumenta.
+        """
+        alvos_do_jogo, jogos_do_alvo, aleatorio = self.alvos_do_jogo, self.jogos_do_alvo, self.aleatorio
+        jogos = list(jogos)
+        contagem = [0] * len(jogos_do_alvo)
+        for jogo in jogos:
+            for a in alvos_do_jogo[jogo]:
+                contagem[a] += 1
+        descobertos = [a for a, c in enumerate(contagem) if c == 0]
+        posicao = [-1] * len(contagem)
+        for i, a in enumerate(descobertos):
+            posicao[a] = i
+
+        temperatura = TEMPERATURA_INICIAL
+        passos = 0
+        while descobertos:
+            passos += 1
+            if passos % 1024 == 0 and time.perf_counter() > prazo:
+                return None
+            novo = aleatorio.choice(jogos_do_alvo[aleatorio.choice(descobertos)])
+            k = aleatorio.randrange(len(jogos))
+            antigo = jogos[k]
+            if novo == antigo:
+                continue
+            for a in alvos_do_jogo[antigo]:
+                contagem[a] -= 1
+            delta = sum(1 for a in alvos_do_jogo[antigo] if contagem[a] == 0)
+            delta -= sum(1 for a in alvos_do_jogo[novo] if contagem[a] == 0)
+            if delta <= 0 or aleatorio.random() < exp(-delta / temperatura):
+                for a in alvos_do_jogo[antigo]:
+                    if contagem[a] == 0 and posicao[a] < 0:
+                        posicao[a] = len(descobertos)
+                        descobertos.append(a)
+                for a in alvos_do_jogo[novo]:
+                    if contagem[a] == 0:
+                        # Remove de descobertos trocando com o último
+                        i, ultimo = posicao[a], descobertos[-1]
+                        descobertos[i], posicao[ultimo] = ultimo, i
+                        descobertos.pop()
+                        posicao[a] = -1
+                    contagem[a] += 1
+                jogos[k] = novo
+            else:
+                for a in alvos_do_jogo[antigo]:
+                    contagem[a] += 1
+            temperatura = max(TEMPERATURA_MINIMA, temperatura * RESFRIAMENTO)
+        return jogos
+
+
+def gerar_fechamento(dezenas, garantia=4, condicao=4, tamanho_jogo=NUM_DEZENAS_SORTEADAS,
+                     tempo_limite=3.0, semente=None):
+    """Jogos de `tamanho_jogo` dezenas que garantem `garantia` acertos se `condicao` sorteadas caírem no pool.
+
+    Devolve a lista de jogos (listas ordenadas de dezenas). O guloso dá uma solução
+    inicial; enquanto houver tempo, tira um jogo da melhor solução e tenta recobrir tudo
+    com o recozimento, parando no limite de Schönheim quando ele se aplica (t = m).
+    """
+    pool = sorted({int(d) for d in dezenas})
+    v = len(pool)
+    if v < tamanho_jogo:
+        raise ValueError(f"O pool precisa de pelo menos {tamanho_jogo} dezenas.")
+    if not 1 <= garantia <= condicao <= min(v, NUM_DEZENAS_SORTEADAS) or garantia > tamanho_jogo:
+        raise ValueError("Garantia inválida: use t se m com t <= m <= 6 e m <= tamanho do pool.")
+    if comb(v, condicao) * comb(v, tamanho_jogo) > MAX_CELULAS_COBERTURA:
+        raise ValueError(f"Pool de {v} dezenas grande demais para a garantia {garantia} se {condicao}.")
+
+    candidatos = _mascaras_combinacoes(pool, tamanho_jogo)
+    alvos = _mascaras_combinacoes(pool, condicao)
+    cobertura = _Cobertura(_matriz_cobertura(alvos, candidatos, garantia), np.random.default_rng(semente))
+
+    prazo = time.perf_counter() + tempo_limite
+    melhor = cobertura.completar([])
+    minimo = limite_inferior_schonheim(v, tamanho_jogo, garantia) if garantia == condicao else 1
+    while len(melhor) > minimo and time.perf_counter() < prazo:
+        retirar = int(cobertura.rng.integers(len(melhor)))
+        tentativa = cobertura.recozer(melhor[:retirar] + melhor[retirar + 1:], prazo)
+        if tentativa is None:
+            break
+        melhor = tentativa
+    return sorted(dezenas_da_mascara(m) for m in candidatos[sorted(set(melhor))])
+
+
+def verificar_fechamento(jogos, dezenas, garantia=4, condicao=4):
+    """Fração das m-combinações do pool em que algum jogo acerta pelo menos `garantia` dezenas."""
+    alvos = _mascaras_combinacoes(sorted({int(d) for d in dezenas}), condicao)
+    mascaras = np.array([np.bitwise_or.reduce(BIT_DEZENA[list(j)]) for j in jogos], dtype=np.uint64)
+    if len(alvos) == 0 or len(mascaras) == 0:
+        return 0.0
+    return float(_matriz_cobertura(alvos, mascaras, garantia).any(axis=1).mean())
@@ -0,0 +1,102 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from mega_cache import versao_acrescentada, versao_dados
+from mega_ciclos import IndiceCiclos
+from mega_dados import COLUNAS_DEZENAS
+from mega_estatisticas import (
+    IndiceIntervalos, IndiceOcorrencias, IndicePares, IndiceTransicoes, IndiceTrios, matriz_ocorrencias,
+)
+
+
+def _somente_leitura(arr):
+    # Uma view própria: trava a escrita sem mexer nas flags do array de origem
+    visao = np.asarray(arr).view()
+    visao.flags.writeable = False
+    return visao
+
+
+class HistoricoMega:
+    """Histórico de concursos e seus índices, montado uma vez por processo.
+
+    A mesma instância é compartilhada, só para leitura, por todas as sessões: cada
+    sessão guarda apenas os limites da sua janela e recebe fatias (views) daqui.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        if df.empty:
+            concursos = np.empty(0, dtype=np.int64)
+            dezenas = np.empty((0, len(COLUNAS_DEZENAS)), dtype=np.uint8)
+            completo = np.empty(0, dtype=bool)
+        else:
+            concursos = df.index.to_numpy(dtype=np.int64)
+            # uint8 contíguo, linhas em ordem crescente (normalizadas na carga, ver mega_dados)
+            dezenas = np.ascontiguousarray(df[COLUNAS_DEZENAS].to_numpy(dtype=np.uint8))
+            completo = df['Completo'].to_numpy(dtype=bool)
+        self.concursos = _somente_leitura(concursos)
+        self.dezenas = _somente_leitura(dezenas)
+        self.completo = _somente_leitura(completo)
+        self.incompletos = int(len(completo) - completo.sum())
+        self.concurso_min = int(concursos[0]) if len(concursos) else 0
+        self.concurso_max = int(concursos[-1]) if len(concursos) else 0
+
+        # A matriz one-hot é a mesma para pares e transições: monta uma vez só
+        ocorrencias = _somente_leitura(matriz_ocorrencias(self.dezenas))
+        self.indice_ocorrencias = IndiceOcorrencias(self.concursos, self.dezenas)
+        self.indice_pares = IndicePares(self.dezenas, ocorrencias=ocorrencias)
+        self.indice_trios = IndiceTrios(self.dezenas)
+        self.indice_intervalos = IndiceIntervalos(self.concursos, self.dezenas)
+        self.indice_ciclos = IndiceCiclos(self.concursos, self.indice_ocorrencias.mascaras)
+        self.indice_transicoes = IndiceTransicoes(self.concursos, self.dezenas, ocorrencias=ocorrencias)
+        # Os resultados em cache são do processo inteiro: a versão identifica o histórico que os gerou
+        self.versao = versao_dados(self.concursos, self.indice_ocorrencias.mascaras)
+
+    def acrescentado(self, df_novos):
+        """Novo histórico com `df_novos` (tabela normalizada, concursos posteriores) no fim.
+
+        Cada índice processa só as linhas novas; os arrays são concatenados em cópias,
+        então esta instância continua intacta para as sessões que ainda a leem.
+        """
+        if self.vazio:
+            return HistoricoMega(df_novos)
+        concursos_novos = df_novos.index.to_numpy(dtype=np.int64)
+        dezenas_novas = np.ascontiguousarray(df_novos[COLUNAS_DEZENAS].to_numpy(dtype=np.uint8))
+        completo_novo = df_novos['Completo'].to_numpy(dtype=bool)
+
+        novo = copy.copy(self)
+        novo.df = pd.concat([self.df, df_novos])
+        novo.concursos = _somente_leitura(np.concatenate([self.concursos, concursos_novos]))
+        novo.dezenas = _somente_leitura(np.concatenate([self.dezenas, dezenas_novas]))
+        novo.completo = _somente_leitura(np.concatenate([self.completo, completo_novo]))
+        novo.incompletos = self.incompletos + int(len(completo_novo) - completo_novo.sum())
+        novo.concurso_max = int(novo.concursos[-1])
+
+        ocorrencias = _somente_leitura(np.concatenate([self.indice_transicoes.ocorrencias, matriz_ocorrencias(dezenas_novas)]))
+        novo.indice_ocorrencias = self.indice_ocorrencias.acrescentado(concursos_novos, dezenas_novas)
+        novo.indice_pares = self.indice_pares.acrescentado(ocorrencias)
+        novo.indice_trios = self.indice_trios.acrescentado(dezenas_novas)
+        novo.indice_intervalos = self.indice_intervalos.acrescentado(concursos_novos, dezenas_novas)
+        mascaras_novas = novo.indice_ocorrencias.mascaras[len(self.concursos):]
+        novo.indice_ciclos = self.indice_ciclos.acrescentado(concursos_novos, mascaras_novas)
+        novo.indice_transicoes = self.indice_transicoes.acrescentado(concursos_novos, dezenas_novas, ocorrencias)
+        novo.versao = versao_acrescentada(self.versao, concursos_novos, mascaras_novas)
+        return novo
+
+    @property
+    def vazio(self):
+        return len(self.concursos) == 0
+
+    def posicoes(self, concurso_inicio, concurso_fim):
+        return self.indice_ocorrencias.posicoes(concurso_inicio, concurso_fim)
+
+    def dezenas_sorteadas(self, pos):
+        """Dezenas do concurso na posição `pos`, sem os zeros de linha incompleta."""
+        dezenas = self.dezenas[pos]
+        return dezenas.tolist() if self.completo[pos] else dezenas[dezenas > 0].tolist()
+
+    def fatia(self, pos_inicio, pos_fim):
+        """Linhas [pos_inicio, pos_fim) da tabela, sem copiar (o pandas só copia se alguém alterar)."""
+        return self.df.iloc[pos_inicio:pos_fim]
@@ -0,0 +1,118 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from mega_dados import (
+    COLUNAS_DEZENAS, NUM_DEZENAS_SORTEADAS, NUM_DEZENAS_TOTAL, ler_novos_concursos, normalizar_tabela,
+    registrar_novos_concursos,
+)
+
+# Ingestão de concursos novos sem reler a planilha: pela API (PublicacaoHistorico.acrescentar)
+# ou por um arquivo de entrada deixado ao lado da planilha. O histórico publicado é trocado
+# por uma versão nova (HistoricoMega.acrescentado) e cada sessão a pega no próximo rerun.
+ARQUIVOS_ENTRADA = ('novos_concursos.csv', 'novos_concursos.json')
+SUFIXO_PROCESSADO = '.processado'
+SUFIXO_REJEITADO = '.rejeitado'
+
+
+def validar_novos_concursos(df_brutos, historico):
+    """Confere os concursos novos (colunas Concurso, Data, B1..B6) e devolve (tabela normalizada, ignorados).
+
+    Cada concurso precisa de número inteiro único, data válida e 6 dezenas distintas de
+    1 a 60; as datas não podem voltar no tempo. Concursos que o histórico já tem são
+    ignorados (reenviar o mesmo arquivo não duplica nada). Qualquer problema levanta
+    ValueError, sem acrescentar nenhuma linha.
+    """
+    if df_brutos.empty:
+        return normalizar_tabela(df_brutos), 0
+
+    concursos = pd.to_numeric(df_brutos['Concurso'], errors='coerce')
+    if concursos.isna().any() or (concursos % 1 != 0).any():
+        raise ValueError("Número de concurso ausente ou não inteiro.")
+    concursos = concursos.to_numpy(dtype=np.int64)
+    repetidos = np.unique(concursos[pd.Series(concursos).duplicated().to_numpy()])
+    if len(repetidos):
+        raise ValueError(f"Concurso repetido no arquivo: {', '.join(map(str, repetidos.tolist()))}.")
+
+    dezenas = df_brutos[COLUNAS_DEZENAS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    invalidas = np.isnan(dezenas).any(axis=1) | (dezenas % 1 != 0).any(axis=1)
+    invalidas |= ((dezenas < 1) | (dezenas > NUM_DEZENAS_TOTAL)).any(axis=1)
+    ordenadas = np.sort(np.nan_to_num(dezenas), axis=1)
+    invalidas |= (ordenadas[:, 1:] == ordenadas[:, :-1]).any(axis=1)
+    if invalidas.any():
+        raise ValueError(
+            f"Concurso {concursos[invalidas.argmax()]}: esperado {NUM_DEZENAS_SORTEADAS} dezenas distintas de 1 a {NUM_DEZENAS_TOTAL}."
+        )
+
+    datas = pd.to_datetime(df_brutos['Data'], dayfirst=True, errors='coerce')
+    if datas.isna().any():
+        raise ValueError(f"Concurso {concursos[datas.isna().to_numpy().argmax()]}: data ausente ou inválida.")
+
+    df = normalizar_tabela(df_brutos.assign(Concurso=concursos))
+    ignorados = int((df.index <= historico.concurso_max).sum()) if not historico.vazio else 0
+    df = df[df.index > historico.concurso_max] if not historico.vazio else df
+
+    datas = df['Data'].to_numpy()
+    if not historico.vazio and len(datas):
+        datas = np.concatenate([historico.df['Data'].to_numpy()[-1:].astype(datas.dtype), datas])
+    datas = datas[~np.isnat(datas)]
+    if (datas[1:] < datas[:-1]).any():
+        raise ValueError("As datas dos concursos novos precisam seguir a ordem dos concursos (e vir depois do último do histórico).")
+    return df, ignorados
+
+
+class PublicacaoHistorico:
+    """Versão publicada do histórico do processo.
+
+    As sessões leem `atual` a cada rerun; acrescentar concursos monta a versão seguinte
+    a partir da atual (custo proporcional às linhas novas), grava o diário e o cache e
+    só então troca `atual`. A versão anterior não é alterada, então quem ainda a está
+    usando termina o rerun com dados consistentes.
+    """
+
+    def __init__(self, file_path, historico):
+        self.file_path = file_path
+        self.atual = historico
+        self._lock = threading.Lock()
+
+    def acrescentar(self, df_brutos):
+        """Valida e publica os concursos novos; devolve {'acrescentados', 'ignorados', 'gravado'}."""
+        with self._lock:
+            return self._acrescentar(df_brutos)
+
+    def _acrescentar(self, df_brutos):
+        historico = self.atual
+        df_novos, ignorados = validar_novos_concursos(df_brutos, historico)
+        if df_novos.empty:
+            return {'acrescentados': 0, 'ignorados': ignorados, 'gravado': False}
+        novo = historico.acrescentado(df_novos)
+        gravado = registrar_novos_concursos(self.file_path, df_novos, len(historico.concursos))
+        self.atual = novo
+        return {'acrescentados': len(df_novos), 'ignorados': ignorados, 'gravado': gravado}
+
+    def verificar_entrada(self):
+        """Ingere o arquivo de entrada (novos_concursos.csv/.json ao lado da planilha), se houver.
+
+        Chamado a cada rerun: sem arquivo, custa só um os.path.exists por nome. Depois de
+        processado o arquivo é renomeado (.processado, ou .rejeitado se for inválido, com o
+        ValueError repassado), então nenhuma outra sessão o processa de novo.
+        """
+        pasta = os.path.dirname(os.path.abspath(self.file_path))
+        caminhos = [os.path.join(pasta, nome) for nome in ARQUIVOS_ENTRADA]
+        if not any(os.path.exists(caminho) for caminho in caminhos):
+            return None
+        with self._lock:
+            for caminho in caminhos:
+                # Outra sessão pode ter processado o arquivo enquanto esta esperava o lock
+                if not os.path.exists(caminho):
+                    continue
+                try:
+                    resultado = self._acrescentar(ler_novos_concursos(caminho))
+                except (ValueError, KeyError, TypeError) as e:
+                    os.replace(caminho, caminho + SUFIXO_REJEITADO)
+                    raise ValueError(f"{os.path.basename(caminho)}: {e}") from e
+                os.replace(caminho, caminho + SUFIXO_PROCESSADO)
+                return resultado
+        return None
@@ -0,0 +1,189 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from mega_bitsets import dezenas_da_mascara, mascara_jogo, matriz_acertos
+
+FAIXAS_PREMIO = {4: 'Quadras', 5: 'Quinas', 6: 'Senas'}
+# Limite de células (jogos x concursos) conferidas por vez, para a memória não crescer com o produto
+CELULAS_POR_BLOCO = 1 << 23
+CAMINHO_BANCO_PADRAO = "jogos_mega.db"
+
+
+def conferir_jogos(mascaras_de_jogos, mascaras, concursos):
+    """Confere todos os jogos contra todos os concursos com AND + popcount em blocos de jogos.
+
+    Devolve, por jogo, quantas quadras/quinas/senas teria feito e a lista de
+    (concurso, acertos) premiados.
+    """
+    mascaras_de_jogos = np.asarray(mascaras_de_jogos, dtype=np.uint64)
+    concursos = np.asarray(concursos)
+    n_jogos = len(mascaras_de_jogos)
+    por_faixa = np.zeros((n_jogos, len(FAIXAS_PREMIO)), dtype=np.int64)
+    premiados = [[] for _ in range(n_jogos)]
+
+    passo = max(1, CELULAS_POR_BLOCO // max(1, len(mascaras)))
+    for inicio in range(0, n_jogos, passo):
+        bloco = mascaras_de_jogos[inicio:inicio + passo]
+        acertos = matriz_acertos(bloco, mascaras)
+        for k, minimo in enumerate(FAIXAS_PREMIO):
+            por_faixa[inicio:inicio + passo, k] = (acertos == minimo).sum(axis=1)
+        jogos, colunas = np.nonzero(acertos >= min(FAIXAS_PREMIO))
+        for j, c in zip((jogos + inicio).tolist(), colunas.tolist()):
+            premiados[j].append((int(concursos[c]), int(acertos[j - inicio, c])))
+
+    resultado = pd.DataFrame(por_faixa, columns=list(FAIXAS_PREMIO.values()))
+    resultado['Premiados'] = premiados
+    return resultado
+
+
+def montar_conferencia(descricoes, mascaras_de_jogos, mascaras, concursos):
+    """Confere os jogos (máscaras, como vêm do repositório) e monta a tabela para exibição."""
+    resultado = conferir_jogos(mascaras_de_jogos, mascaras, concursos)
+    resultado.insert(0, 'Jogo', list(descricoes))
+    resultado.insert(1, 'Dezenas', [
+        ' '.join(f'{d:02d}' for d in dezenas_da_mascara(m)) for m in np.asarray(mascaras_de_jogos, dtype=np.uint64)
+    ])
+    resultado['Premiados'] = [
+        ', '.join(f'#{c} ({a})' for c, a in premios) for premios in resultado['Premiados']
+    ]
+    return resultado
+
+
+class RepositorioJogos:
+    """Jogos salvos em SQLite local, com índices por dono, estratégia e dezena.
+
+    Cada jogo guarda o dono (identificador do usuário), a estratégia, a quantidade
+    de dezenas, a máscara de 64 bits (bit d-1 = dezena d) e o concurso mais recente
+    no momento em que foi criado. A tabela jogo_dezenas indexa cada dezena do jogo,
+    para filtrar por número sem varrer as máscaras. O banco é do processo, então toda
+    consulta e escrita recebe o dono e só enxerga os jogos dele.
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS jogos (
+            id INTEGER PRIMARY KEY,
+            dono TEXT NOT NULL,
+            estrategia TEXT NOT NULL,
+            num_dezenas INTEGER NOT NULL,
+            mascara INTEGER NOT NULL,
+            concurso_criacao INTEGER,
+            criado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS jogo_dezenas (
+            dezena INTEGER NOT NULL,
+            jogo_id INTEGER NOT NULL REFERENCES jogos (id) ON DELETE CASCADE,
+            PRIMARY KEY (dezena, jogo_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_jogo_dezenas_jogo ON jogo_dezenas (jogo_id);
+    """
+    # Criados depois da migração: bancos antigos ainda não têm a coluna dono
+    INDICES = """
+        DROP INDEX IF EXISTS idx_jogos_estrategia;
+        CREATE INDEX IF NOT EXISTS idx_jogos_dono ON jogos (dono, id);
+        CREATE INDEX IF NOT EXISTS idx_jogos_dono_estrategia ON jogos (dono, estrategia, id);
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO_PADRAO):
+        # Uma conexão por processo, compartilhada pelas sessões do Streamlit (threads) sob um lock
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Muda a cada escrita: identifica o estado dos jogos em chaves de cache
+        self.versao = 0
+        self._conexao.execute("PRAGMA foreign_keys = ON")
+        if caminho != ':memory:':
+            self._conexao.execute("PRAGMA journal_mode = WAL")
+        self._conexao.executescript(self.ESQUEMA)
+        colunas = {linha['name'] for linha in self._conexao.execute("PRAGMA table_info(jogos)")}
+        if 'dono' not in colunas:
+            # Jogos de antes da separação por dono ficam sem dono (nenhuma sessão os vê)
+            self._conexao.execute("ALTER TABLE jogos ADD COLUMN dono TEXT NOT NULL DEFAULT ''")
+        self._conexao.executescript(self.INDICES)
+
+    @contextmanager
+    def _transacao(self):
+        # IMMEDIATE reserva a escrita já no início, então ninguém insere entre a leitura do próximo id e o INSERT
+        with self._lock:
+            self._conexao.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conexao
+            except BaseException:
+                self._conexao.execute("ROLLBACK")
+                raise
+            self._conexao.execute("COMMIT")
+            self.versao += 1
+
+    def salvar(self, dono, estrategia, dezenas, concurso_criacao=None):
+        return self.salvar_varios(dono, [(estrategia, dezenas, concurso_criacao)])[0]
+
+    def salvar_varios(self, dono, jogos):
+        """Insere vários jogos (estrategia, dezenas, concurso_criacao) do dono em uma única transação."""
+        linhas_jogos, linhas_dezenas = [], []
+        with self._transacao() as conexao:
+            proximo_id = conexao.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM jogos").fetchone()[0]
+            for jogo_id, (estrategia, dezenas, concurso_criacao) in enumerate(jogos, start=proximo_id):
+                dezenas = sorted({int(d) for d in dezenas})
+                linhas_jogos.append((jogo_id, dono, estrategia, len(dezenas), int(mascara_jogo(dezenas)), concurso_criacao))
+                linhas_dezenas.extend((d, jogo_id) for d in dezenas)
+            conexao.executemany(
+                "INSERT INTO jogos (id, dono, estrategia, num_dezenas, mascara, concurso_criacao) VALUES (?, ?, ?, ?, ?, ?)",
+                linhas_jogos,
+            )
+            conexao.executemany("INSERT INTO jogo_dezenas (dezena, jogo_id) VALUES (?, ?)", linhas_dezenas)
+        return [linha[0] for linha in linhas_jogos]
+
+    def remover(self, dono, ids):
+        """Remove vários jogos do dono em uma única transação (ids de outro dono são ignorados)."""
+        with self._transacao() as conexao:
+            conexao.executemany("DELETE FROM jogos WHERE id = ? AND dono = ?", [(int(i), dono) for i in ids])
+
+    def limpar(self, dono, estrategia=None, dezena=None):
+        filtro, parametros = self._filtro(dono, estrategia, dezena)
+        with self._transacao() as conexao:
+            conexao.execute(f"DELETE FROM jogos WHERE id IN (SELECT j.id FROM jogos j {filtro})", parametros)
+
+    @staticmethod
+    def _filtro(dono, estrategia, dezena):
+        juncao, condicoes, parametros = "", ["j.dono = ?"], []
+        if dezena:
+            juncao = "JOIN jogo_dezenas jd ON jd.jogo_id = j.id AND jd.dezena = ?"
+            parametros.append(int(dezena))
+        parametros.append(dono)
+        if estrategia:
+            condicoes.append("j.estrategia = ?")
+            parametros.append(estrategia)
+        return f"{juncao} WHERE {' AND '.join(condicoes)}", parametros
+
+    def _consultar(self, sql, parametros=()):
+        with self._lock:
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def contar(self, dono, estrategia=None, dezena=None):
+        filtro, parametros = self._filtro(dono, estrategia, dezena)
+        return self._consultar(f"SELECT COUNT(*) FROM jogos j {filtro}", parametros)[0][0]
+
+    def estrategias(self, dono):
+        return [linha[0] for linha in self._consultar(
+            "SELECT DISTINCT estrategia FROM jogos WHERE dono = ? ORDER BY estrategia", (dono,)
+        )]
+
+    def listar(self, dono, estrategia=None, dezena=None, limite=50, deslocamento=0):
+        """Uma página de jogos do dono, do mais recente para o mais antigo."""
+        filtro, parametros = self._filtro(dono, estrategia, dezena)
+        linhas = self._consultar(
+            f"SELECT j.* FROM jogos j {filtro} ORDER BY j.id DESC LIMIT ? OFFSET ?",
+            parametros + [int(limite), int(deslocamento)],
+        )
+        return [dict(linha, dezenas=dezenas_da_mascara(linha['mascara'])) for linha in linhas]
+
+    def mascaras(self, dono, estrategia=None, dezena=None):
+        """ids, estratégias e máscaras de todos os jogos do dono no filtro, para a conferência em lote."""
+        filtro, parametros = self._filtro(dono, estrategia, dezena)
+        linhas = self._consultar(f"SELECT j.id, j.estrategia, j.mascara FROM jogos j {filtro} ORDER BY j.id DESC", parametros)
+        ids = np.array([linha[0] for linha in linhas], dtype=np.int64)
+        mascaras = np.array([linha[2] for linha in linhas], dtype=np.uint64)
+        return ids, [linha[1] for linha in linhas], mascaras
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Instrumentação opcional dos trechos quentes: cada execução do script, e cada execução de
+# uma aba (fragmento), cria um Perfilador e mede suas análises com `with perfil.medir(...)`.
+# Desligado, medir() devolve sempre o mesmo contexto vazio, então o custo é uma chamada de
+# método por trecho.
+ARQUIVO_PERFIL_PADRAO = "perfil_mega.jsonl"
+_lock_arquivo = threading.Lock()
+
+
+class _MedicaoNula:
+    def __enter__(self):
+        return _REGISTRO_NULO
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _RegistroNulo:
+    # Aceita as mesmas atribuições de um registro real e descarta
+    def __setitem__(self, chave, valor):
+        pass
+
+
+_MEDICAO_NULA = _MedicaoNula()
+_REGISTRO_NULO = _RegistroNulo()
+
+
+class Perfilador:
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.registros = []
+        self._inicio = time.perf_counter()
+
+    def medir(self, secao, linhas=None):
+        """Contexto que cronometra o trecho; o registro aceita registro['cache'] = 'acerto'/'falha'."""
+        if not self.ativo:
+            return _MEDICAO_NULA
+        return self._medir(secao, linhas)
+
+    @contextmanager
+    def _medir(self, secao, linhas):
+        registro = {'secao': secao, 'segundos': 0.0, 'linhas': linhas, 'cache': None}
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro['segundos'] = time.perf_counter() - inicio
+            self.registros.append(registro)
+
+    def total(self):
+        return time.perf_counter() - self._inicio
+
+    def tabela(self):
+        """Registros como DataFrame para exibição (ms, linhas e cache por seção)."""
+        if not self.registros:
+            return pd.DataFrame(columns=['Seção', 'ms', 'Linhas', 'Cache'])
+        return pd.DataFrame({
+            'Seção': [r['secao'] for r in self.registros],
+            'ms': [round(r['segundos'] * 1000, 2) for r in self.registros],
+            'Linhas': pd.array([r['linhas'] for r in self.registros], dtype='Int64'),
+            'Cache': [r['cache'] or '' for r in self.registros],
+        })
+
+    def exportar(self, caminho=ARQUIVO_PERFIL_PADRAO, **contexto):
+        """Acrescenta a execução como uma linha JSON (JSON Lines) para análise offline."""
+        linha = {
+            'momento': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'pid': os.getpid(),
+            'total_segundos': self.total(),
+            **contexto,
+            'secoes': list(self.registros),
+        }
+        with _lock_arquivo, open(caminho, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(linha, ensure_ascii=False, default=str) + '\n')
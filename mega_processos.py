@@ -0,0 +1,19 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Pool de processos comum ao backtest, à varredura e à simulação do acaso.
+# 'spawn' evita herdar por fork as threads do servidor do Streamlit.
+
+
+def mapear_em_processos(funcao, tarefas, processos=None):
+    """Aplica `funcao` a cada tarefa e devolve os resultados na ordem das tarefas.
+
+    Usa até `processos` processos (padrão: todos os núcleos), nunca mais que o número
+    de tarefas; com um só, roda no próprio processo, sem pool.
+    """
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    if processos <= 1:
+        return [funcao(tarefa) for tarefa in tarefas]
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(funcao, tarefas))
@@ -0,0 +1,204 @@
+from itertools import combinations
+
+import numpy as np
+
+from mega_dados import NUM_DEZENAS_SORTEADAS, NUM_DEZENAS_TOTAL
+from mega_estatisticas import PARES_D1, PARES_D2, TAMANHO_VETOR
+from mega_processos import mapear_em_processos
+
+# Teste de significância por Monte Carlo: milhares de históricos aleatórios do mesmo tamanho
+# da janela, com as mesmas estatísticas do app (Vezes, Atraso e contagem de pares). O atraso
+# simulado é medido dentro do histórico simulado, então é comparado com o atraso na janela
+# (IndiceOcorrencias.atraso_na_janela), não com o do histórico inteiro. Como as
+# dezenas são intercambiáveis sob o acaso, cada simulação contribui com 60 amostras de
+# Vezes/Atraso e 1770 de pares para as distribuições "por dezena"; o máximo (e o mínimo)
+# de cada simulação dá a versão ajustada para comparações múltiplas. Os trabalhadores só
+# devolvem histogramas, então a soma final é pequena e não depende da ordem.
+SIMULACOES_PADRAO = 10_000
+SIMULACOES_POR_TAREFA = 250
+CONCURSOS_POR_LOTE = 200_000
+CAUDA_ATRASO = 64
+NIVEL_PADRAO = 0.95
+
+# Índice do par {a, b} na ordem de PARES_D1/PARES_D2, preenchido nos dois sentidos para
+# os sorteios simulados não precisarem ser ordenados
+_INDICE_PAR = np.zeros((TAMANHO_VETOR, TAMANHO_VETOR), dtype=np.int32)
+_INDICE_PAR[PARES_D1, PARES_D2] = _INDICE_PAR[PARES_D2, PARES_D1] = np.arange(len(PARES_D1))
+_COLUNAS_PARES = np.array(list(combinations(range(NUM_DEZENAS_SORTEADAS), 2)))
+NUM_PARES = len(PARES_D1)
+
+
+def sortear_concursos(rng, quantidade):
+    """(quantidade, 6) sorteios uniformes sem reposição (linhas fora de ordem).
+
+    Sorteia 6 dezenas com reposição e refaz só as linhas com repetição (~23%): condicionado
+    a não repetir, o resultado é uniforme entre as C(60, 6) combinações.
+    """
+    sorteios = rng.integers(1, NUM_DEZENAS_TOTAL + 1, size=(quantidade, NUM_DEZENAS_SORTEADAS), dtype=np.uint8)
+    refazer = np.arange(quantidade)
+    while len(refazer):
+        parte = sorteios[refazer]
+        repetida = np.zeros(len(refazer), dtype=bool)
+        for i, j in _COLUNAS_PARES:
+            repetida |= parte[:, i] == parte[:, j]
+        refazer = refazer[repetida]
+        sorteios[refazer] = rng.integers(
+            1, NUM_DEZENAS_TOTAL + 1, size=(len(refazer), NUM_DEZENAS_SORTEADAS), dtype=np.uint8
+        )
+    return sorteios
+
+
+def _atrasos(historicos):
+    """Atraso de cada dezena no fim de cada histórico (B, n, 6): concursos desde a última saída, n se nunca."""
+    lote, n = historicos.shape[:2]
+    atraso = np.full((lote, TAMANHO_VETOR), n, dtype=np.int64)
+    pendentes = np.ones((lote, TAMANHO_VETOR), dtype=bool)
+    pendentes[:, 0] = False
+    # Percorre a cauda de trás para frente em blocos; quase todas as dezenas saem nos primeiros blocos
+    for fim in range(n, 0, -CAUDA_ATRASO):
+        inicio = max(0, fim - CAUDA_ATRASO)
+        presentes = np.zeros((lote, fim - inicio, TAMANHO_VETOR), dtype=bool)
+        presentes[
+            np.arange(lote)[:, None, None], np.arange(fim - inicio)[None, :, None], historicos[:, inicio:fim]
+        ] = True
+        saiu = presentes.any(axis=1)
+        ultima = fim - 1 - presentes[:, ::-1].argmax(axis=1)
+        novos = pendentes & saiu
+        atraso[novos] = (n - 1 - ultima)[novos]
+        pendentes &= ~saiu
+        if not pendentes.any():
+            break
+    return atraso[:, 1:]
+
+
+def _histograma(valores, tamanho):
+    return np.bincount(np.asarray(valores).ravel(), minlength=tamanho)[:tamanho]
+
+
+def _simular_tarefa(args):
+    """Histogramas das estatísticas de `simulacoes` históricos aleatórios de `num_concursos`."""
+    num_concursos, simulacoes, semente = args
+    rng = np.random.default_rng(semente)
+    tamanho = num_concursos + 1
+    hist = {nome: np.zeros(tamanho, dtype=np.int64) for nome in (
+        'vezes', 'vezes_max', 'vezes_min', 'atraso', 'atraso_max', 'pares', 'pares_max'
+    )}
+    por_lote = max(1, CONCURSOS_POR_LOTE // max(1, num_concursos))
+    for inicio in range(0, simulacoes, por_lote):
+        lote = min(por_lote, simulacoes - inicio)
+        historicos = sortear_concursos(rng, lote * num_concursos).reshape(lote, num_concursos, NUM_DEZENAS_SORTEADAS)
+        deslocamento = np.arange(lote)[:, None, None]
+
+        vezes = np.bincount(
+            (deslocamento * TAMANHO_VETOR + historicos).ravel(), minlength=lote * TAMANHO_VETOR
+        ).reshape(lote, TAMANHO_VETOR)[:, 1:]
+        pares = np.bincount(
+            (deslocamento * NUM_PARES + _INDICE_PAR[historicos[..., _COLUNAS_PARES[:, 0]], historicos[..., _COLUNAS_PARES[:, 1]]]).ravel(),
+            minlength=lote * NUM_PARES
+        ).reshape(lote, NUM_PARES)
+        atraso = _atrasos(historicos)
+
+        hist['vezes'] += _histograma(vezes, tamanho)
+        hist['vezes_max'] += _histograma(vezes.max(axis=1), tamanho)
+        hist['vezes_min'] += _histograma(vezes.min(axis=1), tamanho)
+        hist['atraso'] += _histograma(atraso, tamanho)
+        hist['atraso_max'] += _histograma(atraso.max(axis=1), tamanho)
+        hist['pares'] += _histograma(pares, tamanho)
+        hist['pares_max'] += _histograma(pares.max(axis=1), tamanho)
+    return hist
+
+
+def _p_acima(hist, valores):
+    """P(X >= valor) empírico com a correção (1 + k) / (1 + N), que nunca dá p = 0."""
+    acima = np.concatenate([np.cumsum(hist[::-1])[::-1], [0]])
+    valores = np.clip(np.asarray(valores, dtype=np.int64), 0, len(hist))
+    return (1 + acima[valores]) / (1 + hist.sum())
+
+
+def _p_abaixo(hist, valores):
+    abaixo = np.concatenate([[0], np.cumsum(hist)])
+    valores = np.clip(np.asarray(valores, dtype=np.int64) + 1, 0, len(hist))
+    return (1 + abaixo[valores]) / (1 + hist.sum())
+
+
+def _quantil(hist, q):
+    return int(np.searchsorted(np.cumsum(hist), q * hist.sum(), side='left'))
+
+
+class DistribuicaoAcaso:
+    """Distribuições de Vezes, Atraso e pares sob o acaso, para uma janela de `num_concursos`."""
+
+    def __init__(self, num_concursos, simulacoes, histogramas):
+        self.num_concursos = num_concursos
+        self.simulacoes = simulacoes
+        self.histogramas = histogramas
+
+    def faixa_vezes(self, nivel=NIVEL_PADRAO):
+        """(inferior, superior) de Vezes para uma dezena, e a faixa simultânea para as 60."""
+        cauda = (1 - nivel) / 2
+        hist = self.histogramas
+        return {
+            'inferior': _quantil(hist['vezes'], cauda),
+            'superior': _quantil(hist['vezes'], 1 - cauda),
+            'inferior_simultanea': _quantil(hist['vezes_min'], cauda),
+            'superior_simultanea': _quantil(hist['vezes_max'], 1 - cauda),
+            'media': self.num_concursos * NUM_DEZENAS_SORTEADAS / NUM_DEZENAS_TOTAL,
+        }
+
+    def p_valores_dezenas(self, df_freq_e_atraso, atraso_na_janela):
+        """Acrescenta ao DataFrame Dezena/Vezes/Atraso o atraso na janela e os p-valores de quente, fria e atraso.
+
+        `atraso_na_janela` vem na ordem das linhas do DataFrame. As colunas "ajustado"
+        comparam com o máximo (ou mínimo) das 60 dezenas de cada simulação: é a chance
+        de o acaso produzir um destaque assim em alguma dezena.
+        """
+        hist = self.histogramas
+        vezes = df_freq_e_atraso['Vezes'].to_numpy()
+        atraso = np.asarray(atraso_na_janela, dtype=np.int64)
+        df = df_freq_e_atraso.copy()
+        df['Atraso na Janela'] = atraso
+        df['p Quente'] = _p_acima(hist['vezes'], vezes)
+        df['p Quente (ajustado)'] = _p_acima(hist['vezes_max'], vezes)
+        df['p Fria'] = _p_abaixo(hist['vezes'], vezes)
+        df['p Fria (ajustado)'] = _p_abaixo(hist['vezes_min'], vezes)
+        df['p Atraso'] = _p_acima(hist['atraso'], atraso)
+        df['p Atraso (ajustado)'] = _p_acima(hist['atraso_max'], atraso)
+        return df
+
+    def p_valores_pares(self, frequencias):
+        """(p, p ajustado) de cada contagem de par: P(par >= f) e P(maior dos 1770 pares >= f)."""
+        return _p_acima(self.histogramas['pares'], frequencias), _p_acima(self.histogramas['pares_max'], frequencias)
+
+
+def simular_acaso(num_concursos, simulacoes=SIMULACOES_PADRAO, semente=2025, processos=None):
+    """Simula `simulacoes` históricos aleatórios de `num_concursos` entre processos.
+
+    As tarefas têm tamanho fixo e semente própria (SeedSequence.spawn), então o resultado
+    não depende do número de processos.
+    """
+    num_concursos = int(num_concursos)
+    lotes = [min(SIMULACOES_POR_TAREFA, simulacoes - i) for i in range(0, simulacoes, SIMULACOES_POR_TAREFA)]
+    sementes = np.random.SeedSequence(semente).spawn(len(lotes))
+    tarefas = [(num_concursos, lote, s) for lote, s in zip(lotes, sementes)]
+
+    resultados = mapear_em_processos(_simular_tarefa, tarefas, processos)
+
+    histogramas = None
+    for parcial in resultados:
+        if histogramas is None:
+            histogramas = parcial
+        else:
+            for nome, valores in parcial.items():
+                histogramas[nome] += valores
+    return DistribuicaoAcaso(num_concursos, simulacoes, histogramas)
+
+
+def tabela_significancia(distribuicao, df_freq_e_atraso, atraso_na_janela):
+    """Dezenas com p-valores, ordenadas por Vezes como o gráfico de frequência."""
+    df = distribuicao.p_valores_dezenas(df_freq_e_atraso, atraso_na_janela)
+    return df.sort_values(by='Vezes', ascending=False).reset_index(drop=True)
+
+
+def adicionar_p_valores_pares(distribuicao, df_pares):
+    p, p_ajustado = distribuicao.p_valores_pares(df_pares['Frequencia'].to_numpy())
+    return df_pares.assign(**{'p Par': p, 'p Par (ajustado)': p_ajustado})
@@ -0,0 +1,189 @@
+import heapq
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from mega_dados import NUM_DEZENAS_SORTEADAS, NUM_DEZENAS_TOTAL
+from mega_estatisticas import EH_PAR, EH_PRIMO, TAMANHO_VETOR
+from mega_processos import mapear_em_processos
+
+# Varredura exaustiva das C(60, 6) = 50.063.860 combinações. O espaço é percorrido em
+# ordem lexicográfica em blocos de prefixo (a, b): as combinações que começam por a < b
+# são a < b < (4 dezenas de b+1..60), e essas quádruplas são exatamente a cauda da tabela
+# lexicográfica das quádruplas de 3..60, montada uma vez por processo. Cada bloco ocupa
+# um trecho contíguo do arquivo de scores (memmap float32, 200 MB em disco), então a
+# posição no arquivo é o rank lexicográfico da combinação e a RAM fica limitada a um bloco.
+TOTAL_COMBINACOES = comb(NUM_DEZENAS_TOTAL, NUM_DEZENAS_SORTEADAS)
+TAMANHO_SUFIXO = NUM_DEZENAS_SORTEADAS - 2
+COMBINACOES_POR_TAREFA = 2_000_000
+TOP_K_PADRAO = 100
+ARQUIVO_SCORES = "varredura_scores.f32"
+# Combinações reprovadas nos filtros ficam com -inf no arquivo
+SCORE_REPROVADO = -np.inf
+
+# Posições (i, j) dos 6 pares dentro da quádrupla do sufixo
+_PARES_SUFIXO = list(combinations(range(TAMANHO_SUFIXO), 2))
+_tabela_sufixos = None
+
+
+def _sufixos():
+    """Quádruplas de 3..60 em ordem lexicográfica, com soma, pares e primos pré-calculados."""
+    global _tabela_sufixos
+    if _tabela_sufixos is None:
+        quadruplas = np.array(list(combinations(range(3, TAMANHO_VETOR), TAMANHO_SUFIXO)), dtype=np.int16)
+        _tabela_sufixos = {
+            'dezenas': quadruplas,
+            'soma': quadruplas.sum(axis=1, dtype=np.int16),
+            'qtd_pares': EH_PAR[quadruplas].sum(axis=1, dtype=np.int8),
+            'qtd_primos': EH_PRIMO[quadruplas].sum(axis=1, dtype=np.int8),
+            # Índice do par (x, y) na matriz 61x61 achatada
+            'indices_pares': np.stack(
+                [quadruplas[:, i] * TAMANHO_VETOR + quadruplas[:, j] for i, j in _PARES_SUFIXO], axis=1
+            ).astype(np.int32),
+        }
+    return _tabela_sufixos
+
+
+def _prefixos():
+    """(a, b, posição inicial no arquivo, tamanho) de cada bloco, em ordem lexicográfica."""
+    blocos, posicao = [], 0
+    for a in range(1, NUM_DEZENAS_TOTAL - NUM_DEZENAS_SORTEADAS + 2):
+        for b in range(a + 1, NUM_DEZENAS_TOTAL - TAMANHO_SUFIXO + 1):
+            tamanho = comb(NUM_DEZENAS_TOTAL - b, TAMANHO_SUFIXO)
+            blocos.append((a, b, posicao, tamanho))
+            posicao += tamanho
+    return blocos
+
+
+def combinacao_da_posicao(posicao):
+    """Inverso do rank lexicográfico: a combinação guardada em `posicao` do arquivo de scores."""
+    combinacao, inicio, restante = [], 1, int(posicao)
+    for faltam in range(NUM_DEZENAS_SORTEADAS, 0, -1):
+        d = inicio
+        while restante >= comb(NUM_DEZENAS_TOTAL - d, faltam - 1):
+            restante -= comb(NUM_DEZENAS_TOTAL - d, faltam - 1)
+            d += 1
+        combinacao.append(d)
+        inicio = d + 1
+    return combinacao
+
+
+def _pontuar_bloco(a, b, tamanho, score_dezena, coocorrencia, peso_pares, filtros):
+    """Scores das `tamanho` combinações de prefixo (a, b); reprovadas nos filtros viram -inf."""
+    sufixos = _sufixos()
+    trecho = slice(len(sufixos['dezenas']) - tamanho, None)
+    quadruplas = sufixos['dezenas'][trecho]
+
+    # Com o prefixo fixo, o score vira constante + peso de cada dezena do sufixo + pares do sufixo
+    constante = score_dezena[a] + score_dezena[b] + peso_pares * coocorrencia[a, b]
+    peso = score_dezena + peso_pares * (coocorrencia[a] + coocorrencia[b])
+    score = constante + peso[quadruplas].sum(axis=1)
+    if peso_pares:
+        score += peso_pares * coocorrencia.ravel()[sufixos['indices_pares'][trecho]].sum(axis=1)
+
+    soma = sufixos['soma'][trecho] + (a + b)
+    qtd_pares = sufixos['qtd_pares'][trecho] + int(EH_PAR[a]) + int(EH_PAR[b])
+    qtd_primos = sufixos['qtd_primos'][trecho] + int(EH_PRIMO[a]) + int(EH_PRIMO[b])
+    aprovadas = (
+        (soma >= filtros['soma'][0]) & (soma <= filtros['soma'][1])
+        & (qtd_pares >= filtros['pares'][0]) & (qtd_pares <= filtros['pares'][1])
+        & (qtd_primos >= filtros['primos'][0]) & (qtd_primos <= filtros['primos'][1])
+    )
+    return np.where(aprovadas, score, SCORE_REPROVADO).astype(np.float32)
+
+
+def _maiores_do_bloco(scores, posicao_inicial, top_k):
+    """(score, posição) dos top_k maiores scores aprovados do bloco."""
+    if len(scores) > top_k:
+        idx = np.argpartition(scores, len(scores) - top_k)[len(scores) - top_k:]
+    else:
+        idx = np.arange(len(scores))
+    idx = idx[np.isfinite(scores[idx])]
+    return [(float(scores[i]), posicao_inicial + int(i)) for i in idx]
+
+
+def _varrer_tarefa(args):
+    blocos, caminho, score_dezena, coocorrencia, peso_pares, filtros, top_k = args
+    arquivo = None if caminho is None else np.memmap(caminho, dtype=np.float32, mode='r+', shape=(TOTAL_COMBINACOES,))
+    melhores = []
+    try:
+        for a, b, posicao, tamanho in blocos:
+            scores = _pontuar_bloco(a, b, tamanho, score_dezena, coocorrencia, peso_pares, filtros)
+            if arquivo is not None:
+                arquivo[posicao:posicao + tamanho] = scores
+            melhores.extend(_maiores_do_bloco(scores, posicao, top_k))
+            melhores = heapq.nlargest(top_k, melhores)
+    finally:
+        if arquivo is not None:
+            arquivo.flush()
+            del arquivo
+    return melhores
+
+
+def _agrupar_blocos(blocos, combinacoes_por_tarefa):
+    tarefas, atual, acumulado = [], [], 0
+    for bloco in blocos:
+        atual.append(bloco)
+        acumulado += bloco[3]
+        if acumulado >= combinacoes_por_tarefa:
+            tarefas.append(atual)
+            atual, acumulado = [], 0
+    if atual:
+        tarefas.append(atual)
+    return tarefas
+
+
+def varrer_combinacoes(score_dezena, coocorrencia=None, peso_pares=0.0, soma=(0, 360), pares=(0, 6),
+                       primos=(0, 6), top_k=TOP_K_PADRAO, caminho=None, processos=None):
+    """Pontua todas as combinações de 6 dezenas e devolve as top_k aprovadas nos filtros.
+
+    score = soma de `score_dezena` (vetor de 60, dezena 1 na posição 0) das 6 dezenas
+    + `peso_pares` x soma da `coocorrencia` (matriz 60x60) dos 15 pares da combinação.
+    Os filtros são intervalos fechados de soma, quantidade de pares e de primos. Com
+    `caminho`, o score de cada combinação (-inf se reprovada) é gravado num memmap
+    float32 indexado pelo rank lexicográfico (veja combinacao_da_posicao). Os blocos são
+    distribuídos entre `processos` (padrão: todos os núcleos) e cada tarefa devolve só o
+    seu top_k; a fusão final mantém um heap limitado a top_k.
+    """
+    # Vetores com a posição 0 vazia, para indexar direto pela dezena
+    pesos = np.zeros(TAMANHO_VETOR, dtype=np.float64)
+    pesos[1:] = np.asarray(score_dezena, dtype=np.float64)
+    matriz = np.zeros((TAMANHO_VETOR, TAMANHO_VETOR), dtype=np.float64)
+    if coocorrencia is not None:
+        matriz[1:, 1:] = np.asarray(coocorrencia, dtype=np.float64)
+    filtros = {'soma': soma, 'pares': pares, 'primos': primos}
+
+    if caminho is not None:
+        # Cria (ou trunca) o arquivo no tamanho final antes de os processos o abrirem
+        np.memmap(caminho, dtype=np.float32, mode='w+', shape=(TOTAL_COMBINACOES,)).flush()
+
+    tarefas = [
+        (blocos, caminho, pesos, matriz, float(peso_pares), filtros, top_k)
+        for blocos in _agrupar_blocos(_prefixos(), COMBINACOES_POR_TAREFA)
+    ]
+    resultados = mapear_em_processos(_varrer_tarefa, tarefas, processos)
+
+    melhores = []
+    for parcial in resultados:
+        for item in parcial:
+            if len(melhores) < top_k:
+                heapq.heappush(melhores, item)
+            elif item > melhores[0]:
+                heapq.heapreplace(melhores, item)
+    return tabela_varredura(sorted(melhores, key=lambda item: (-item[0], item[1])))
+
+
+def tabela_varredura(melhores):
+    """DataFrame das combinações (score, posição) já ordenadas, com seus padrões."""
+    jogos = [combinacao_da_posicao(posicao) for _, posicao in melhores]
+    dezenas = np.array(jogos, dtype=np.int64).reshape(-1, NUM_DEZENAS_SORTEADAS)
+    return pd.DataFrame({
+        'Jogo': [' '.join(f'{d:02d}' for d in jogo) for jogo in jogos],
+        'Score': [score for score, _ in melhores],
+        'Soma': dezenas.sum(axis=1),
+        'Pares': EH_PAR[dezenas].sum(axis=1),
+        'Primos': EH_PRIMO[dezenas].sum(axis=1),
+        'Posição': [posicao for _, posicao in melhores],
+    })